@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# VERSION: v.0.2.12
+# VERSION: v.0.2.38
 
 import os
 import curses
@@ -9,16 +9,148 @@ import time
 import sys
 import subprocess
 import json
-from collections import defaultdict
+import atexit
+import argparse
+import threading
+import bisect
+import ctypes
+import ctypes.util
+import errno
+import re
+import fcntl
+import select
+import struct
+from array import array
+import signal
+from collections import defaultdict, OrderedDict
 
 # --- Metadata ---
-# Version: 0.2.12
-# Added: Path highlighting at the point of divergence.
-# Added: Intelligent caching (only re-scans if folder timestamp changes).
+# Version: 0.2.38
+# Changed: Fast start - reopens the last folder, cursor, marked roots and review from a session file; Pillow loads on first [p].
+# Added: [/] incremental review filter (name, dir:, ext:, re:, >size <size) with [D] bulk delete of the matches.
+# Added: `ingest INCOMING --index SHARD` - new / already archived / near-duplicate, hashing only the incoming batch.
 
-VERSION = "v.0.2.12"
+VERSION = "v.0.2.38"
 IMG_EXTS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff')
 CACHE_FILE = ".img_dups_cache"
+INDEX_FILE = ".img_hash_index"   # per-root {relpath: [size, mtime_ns, hash]}, reused across scans
+QUICK_HASH_BYTES = 8192          # default mode only reads the first 8k
+READ_CHUNK = 1 << 20             # reused readinto() buffer for full-file hashing
+
+HASH_ALGOS = {"md5": hashlib.md5, "blake2b": lambda: hashlib.blake2b(digest_size=16)}
+try:
+    import xxhash  # optional: pip install xxhash
+    HASH_ALGOS["xxh3"] = xxhash.xxh3_128
+except ImportError: pass
+HASH_CONFIG = {"algo": "md5", "full": False, "order": "auto"}
+
+PILLOW = {}  # Pillow's Image module, imported on the first [p] rather than at startup
+
+def pillow():
+    """PIL.Image (optional: pip install Pillow, needed for [p] previews), or None if it is not installed."""
+    if "Image" not in PILLOW:
+        try: from PIL import Image
+        except ImportError: Image = None
+        PILLOW["Image"] = Image
+    return PILLOW["Image"]
+
+THUMB_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dupImgBrowser", "thumbs")
+THUMB_SIZE = 96                  # longest side of a stored thumbnail, in pixels
+THUMB_CACHE_MAX = 256 << 20      # on-disk thumbnail cache, least recently used evicted first
+THUMB_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+PREFETCH_SETS = 2                # sets either side of the cursor to thumbnail ahead of time
+SESSION_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dupImgBrowser", "session.json")
+REVIEW_FILE = os.path.join(os.path.dirname(SESSION_FILE), "review.json")  # result set of a review left open
+SNAPSHOT_MAX = 20000             # listings longer than this are not stored in the session, just re-read
+
+# --- Metrics (--metrics / --profile) ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: ScanMetrics, _PhaseTimer, _NullTimer, add_metrics_args.
+
+class ScanMetrics:
+    """Per-phase wall time, call counts and bytes. A no-op until enable() is called."""
+    def __init__(self, tool, version):
+        self.tool, self.version, self.enabled = tool, version, False
+        self.phases, self.counters = {}, defaultdict(int)
+        self.started, self.profiler = time.perf_counter(), None
+
+    def enable(self, metrics_path=None, profile_path=None):
+        self.enabled, self.started = True, time.perf_counter()
+        if profile_path:
+            import cProfile
+            self.profiler = cProfile.Profile(); self.profiler.enable()
+        atexit.register(self.finish, metrics_path, profile_path)
+
+    def phase(self, name):
+        return _PhaseTimer(self, name) if self.enabled else _NULL_TIMER
+
+    def add(self, phase, seconds=0.0, calls=0, nbytes=0):
+        if not self.enabled: return  # the review records its draws whether or not metrics are on
+        rec = self.phases.setdefault(phase, [0.0, 0, 0])
+        rec[0] += seconds; rec[1] += calls; rec[2] += nbytes
+
+    def count(self, name, n=1):
+        if self.enabled: self.counters[name] += n
+
+    def summary(self):
+        phases = {}
+        for name, (secs, calls, nbytes) in self.phases.items():
+            phases[name] = {"seconds": round(secs, 6), "calls": calls, "bytes": nbytes,
+                            "bytes_per_sec": round(nbytes / secs, 1) if secs > 0 else 0.0}
+        return {"tool": self.tool, "version": self.version, "timestamp": round(time.time(), 3),
+                "wall_seconds": round(time.perf_counter() - self.started, 6),
+                "phases": phases, "counters": dict(self.counters)}
+
+    def prometheus(self, data):
+        tool = f'tool="{self.tool}"'
+        out = ["# TYPE scan_wall_seconds gauge", f"scan_wall_seconds{{{tool}}} {data['wall_seconds']}",
+               "# TYPE scan_last_run_timestamp_seconds gauge", f"scan_last_run_timestamp_seconds{{{tool}}} {data['timestamp']}"]
+        for metric, key in (("scan_phase_seconds", "seconds"), ("scan_phase_calls", "calls"),
+                            ("scan_phase_bytes", "bytes"), ("scan_phase_bytes_per_second", "bytes_per_sec")):
+            out.append(f"# TYPE {metric} gauge")
+            for name, p in data["phases"].items(): out.append(f'{metric}{{{tool},phase="{name}"}} {p[key]}')
+        out.append("# TYPE scan_counter gauge")
+        for name, n in data["counters"].items(): out.append(f'scan_counter{{{tool},name="{name}"}} {n}')
+        return "\n".join(out) + "\n"
+
+    def finish(self, metrics_path=None, profile_path=None):
+        if self.profiler:
+            self.profiler.disable(); self.profiler.dump_stats(profile_path)
+        data = self.summary()
+        print(f"[metrics] {self.tool} wall {data['wall_seconds']:.3f}s", file=sys.stderr)
+        for name, p in sorted(data["phases"].items(), key=lambda kv: -kv[1]["seconds"]):
+            rate = f" {p['bytes_per_sec'] / 1048576:.1f} MiB/s" if p["bytes"] else ""
+            print(f"[metrics]   {name:<12} {p['seconds']:9.3f}s  x{p['calls']}{rate}", file=sys.stderr)
+        if not metrics_path: return
+        try:
+            tmp = metrics_path + ".tmp"  # atomic swap so node_exporter never reads a partial file
+            with open(tmp, 'w', encoding='utf-8') as f:
+                if metrics_path.endswith(".prom"): f.write(self.prometheus(data))
+                else: json.dump(data, f, indent=2)
+            os.replace(tmp, metrics_path)
+        except OSError as e: print(f"[metrics] Could not write '{metrics_path}': {e}", file=sys.stderr)
+
+class _PhaseTimer:
+    __slots__ = ("metrics", "name", "nbytes", "t0")
+    def __init__(self, metrics, name):
+        self.metrics, self.name, self.nbytes = metrics, name, 0
+    def __enter__(self):
+        self.t0 = time.perf_counter(); return self
+    def __exit__(self, *exc):
+        self.metrics.add(self.name, time.perf_counter() - self.t0, 1, self.nbytes)
+
+class _NullTimer:
+    __slots__ = ("nbytes",)
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+_NULL_TIMER = _NullTimer(); _NULL_TIMER.nbytes = 0
+
+def add_metrics_args(parser):
+    parser.add_argument('--metrics', metavar='FILE', help="Write a per-phase timing summary at exit (JSON, or Prometheus textfile if FILE ends in .prom).")
+    parser.add_argument('--profile', metavar='FILE', help="Also dump cProfile stats to FILE (view with: python3 -m pstats FILE).")
+
+METRICS = ScanMetrics("dupImgBrowser", VERSION)
 
 def get_connection_info():
     ssh_conn = os.environ.get("SSH_CONNECTION", "")
@@ -27,19 +159,192 @@ def get_connection_info():
     label = "[ REMOTE ]" if ssh_conn else "[ LOCAL ]"
     return f"{label} {user}@{hostname}"
 
+_hash_buffers = threading.local()
+
+def hash_file(filepath, algo="md5", limit=None):
+    """
+    Hash a file with HASH_ALGOS[algo], reading at most `limit` bytes (None = whole file).
+    Reads go through one reused bytearray per thread, so a file truncated mid-hash just ends early.
+    """
+    hasher = HASH_ALGOS[algo]()
+    with METRICS.phase("hash") as t, open(filepath, 'rb', buffering=0) as f:
+        fd = f.fileno(); size = os.fstat(fd).st_size
+        if limit is None: advise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+        try:
+            view = getattr(_hash_buffers, "view", None)
+            if view is None: view = _hash_buffers.view = memoryview(bytearray(READ_CHUNK))
+            remaining = size if limit is None else min(limit, size)
+            while remaining > 0:
+                n = f.readinto(view[:min(remaining, READ_CHUNK)])
+                if not n: break
+                hasher.update(view[:n]); t.nbytes += n; remaining -= n
+        finally: advise(fd, 0, 0, "POSIX_FADV_DONTNEED")  # a scan streams through once; keep the page cache for everything else
+    return hasher.hexdigest()
+
+def hash_mode():
+    """Identifies the configured hash so cached results from another mode are not reused."""
+    return f"{HASH_CONFIG['algo']}:{'full' if HASH_CONFIG['full'] else QUICK_HASH_BYTES}"
+
 def get_image_hash(filepath):
-    """Generate a quick MD5 hash of the first 8k."""
-    hasher = hashlib.md5()
+    """Hash per HASH_CONFIG: the first 8k by default, the whole file with --full."""
     try:
-        with open(filepath, 'rb') as f:
-            buf = f.read(8192) 
-            hasher.update(buf)
-        return hasher.hexdigest()
+        return hash_file(filepath, HASH_CONFIG["algo"], None if HASH_CONFIG["full"] else QUICK_HASH_BYTES)
     except:
         return None
 
+# --- Read Ordering (hashing on spinning disks) ---
+
+FS_IOC_FIEMAP = 0xC020660B                   # linux/fs.h: _IOWR('f', 11, struct fiemap)
+FIEMAP_HEAD = struct.Struct("=QQIIII")       # fm_start, fm_length, fm_flags, fm_mapped_extents, fm_extent_count, fm_reserved
+FIEMAP_EXTENT = struct.Struct("=QQQQQIIII")  # fe_logical, fe_physical, fe_length, reserved x2, fe_flags, reserved x3
+PREFETCH_FILES = 8               # files ahead of the hasher that get a WILLNEED readahead hint
+PREFETCH_BYTES = 4 << 20         # readahead asked for per file in --full mode
+READ_ORDERS = ("auto", "extent", "inode", "walk")
+_rotational = {}
+
+def advise(fd, offset, length, advice):
+    """posix_fadvise by name; a no-op where the platform lacks it."""
+    if hasattr(os, advice):
+        try: os.posix_fadvise(fd, offset, length, getattr(os, advice))
+        except OSError: pass
+
+def prefetch(path, length):
+    """Ask the kernel to start reading the head of path in the background."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try: advise(fd, 0, length, "POSIX_FADV_WILLNEED")
+        finally: os.close(fd)
+    except OSError: pass
+
+def is_rotational(dev):
+    """True if st_dev sits on a spinning disk, per Linux sysfs (False when unknown)."""
+    if dev not in _rotational:
+        base = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+        _rotational[dev] = False
+        for path in (base + "/queue/rotational", base + "/../queue/rotational"):  # whole disk, then a partition's parent
+            try:
+                with open(path) as f: _rotational[dev] = f.read().strip() == "1"
+                break
+            except OSError: continue
+    return _rotational[dev]
+
+def physical_offset(path):
+    """Physical byte offset of the file's first extent (FIEMAP ioctl), or None if unsupported."""
+    buf = bytearray(FIEMAP_HEAD.size + FIEMAP_EXTENT.size)
+    FIEMAP_HEAD.pack_into(buf, 0, 0, 0xFFFFFFFFFFFFFFFF, 0, 0, 1, 0)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try: fcntl.ioctl(fd, FS_IOC_FIEMAP, buf)
+        finally: os.close(fd)
+    except OSError: return None
+    if not FIEMAP_HEAD.unpack_from(buf)[3]: return None  # no mapped extents (empty or inline data)
+    return FIEMAP_EXTENT.unpack_from(buf, FIEMAP_HEAD.size)[1]
+
+def order_reads(work):
+    """
+    Sort [(path, dev, ino)] so each disk is read front to back instead of in os.walk order:
+    by device, then by first physical extent on rotational disks (or with --read-order extent),
+    else by inode number, which ext4/xfs allocate roughly in on-disk order.
+    """
+    order = HASH_CONFIG["order"]
+    if order == "walk": return list(work)
+    def key(item):
+        path, dev, ino = item
+        if order == "extent" or (order == "auto" and is_rotational(dev)):
+            offset = physical_offset(path)
+            if offset is not None: return (dev, 0, offset, ino)
+        return (dev, 1, ino, 0)
+    with METRICS.phase("read_order"):
+        return sorted(work, key=key)
+
+# --- Session State (fast start) ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: list_dir, load_session, save_session, ListingCheck, ReviewLoad.
+
+def list_dir(path, show_hidden):
+    """(entries, dir names, mtime_ns) for path: '..', folders, then files. One scandir, no per-entry stat."""
+    with METRICS.phase("listdir"):
+        mtime_ns = os.stat(path).st_mtime_ns  # taken first, so a change during the listing still shows next time
+        with os.scandir(path) as it:
+            items = [(e.name, e.is_dir()) for e in it if show_hidden or not e.name.startswith('.')]
+    dirs = sorted((n for n, is_dir in items if is_dir), key=str.lower)
+    files = sorted((n for n, is_dir in items if not is_dir), key=str.lower)
+    return ([".."] if path != "/" else []) + dirs + files, set(dirs), mtime_ns
+
+def load_session():
+    try:
+        with open(SESSION_FILE, 'r') as f: return json.load(f)
+    except: return {}
+
+def save_session(state):
+    try:
+        os.makedirs(os.path.dirname(SESSION_FILE), exist_ok=True); tmp = SESSION_FILE + ".tmp"
+        with open(tmp, 'w') as f: json.dump(state, f)
+        os.replace(tmp, SESSION_FILE)
+    except: pass
+
+class ListingCheck:
+    """
+    Re-validates a restored listing snapshot off the UI thread, so a slow mount
+    never delays the first frame: stat the folder and, only if its mtime moved,
+    list it again. `result` then holds the fresh (entries, dirs, mtime_ns).
+    """
+    def __init__(self, path, mtime_ns, show_hidden):
+        self.result, self.done = None, False
+        threading.Thread(target=self._run, args=(path, mtime_ns, show_hidden), daemon=True).start()
+
+    def _run(self, path, mtime_ns, show_hidden):
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns: self.result = list_dir(path, show_hidden)
+        except OSError: self.result = ([".. [Error]"], set(), 0)
+        self.done = True
+
+def load_review_snapshot(review):
+    """The saved results of review (a SESSION["review"]) if none of its roots changed since, else a single root's scan cache, else None."""
+    roots = review["roots"]
+    try:
+        with METRICS.phase("review_load"), open(REVIEW_FILE, 'r') as f: data = json.load(f)
+        if data["roots"] == roots and data["hash_mode"] == hash_mode() and data["mtimes"] == [os.path.getmtime(r) for r in roots]:
+            return DupResults.from_json(data["results"])
+    except: pass
+    return load_scan_cache(roots[0]) if len(roots) == 1 else None
+
+def save_review_snapshot(review, results):
+    roots = review["roots"]
+    try:
+        os.makedirs(os.path.dirname(REVIEW_FILE), exist_ok=True); tmp = REVIEW_FILE + ".tmp"
+        with METRICS.phase("review_save"), open(tmp, 'w') as f:
+            json.dump({"roots": roots, "hash_mode": hash_mode(), "mtimes": [os.path.getmtime(r) for r in roots],
+                       "results": results.to_json()}, f)
+        os.replace(tmp, REVIEW_FILE)
+    except: pass
+
+class ReviewLoad:
+    """
+    Loads the results of the review that was open when the last session ended,
+    off the UI thread like ListingCheck. `result` is a DupResults, or None if
+    it cannot be restored (see load_review_snapshot).
+    """
+    def __init__(self, review):
+        self.review, self.result, self.done = review, None, False
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        try: self.result = load_review_snapshot(self.review)
+        except: pass
+        self.done = True
+
 # --- UI Helpers ---
 
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: human_size, draw_status, draw_popup_confirm.
+
+SESSION = {"reclaimed": 0, "deleted": 0}  # running totals for this run of the browser
+
+def human_size(n):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024 or unit == "TB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
 def draw_status(stdscr, message, wait=0.8):
     h, w = stdscr.getmaxyx(); win_w = min(len(message) + 14, w-4)
     win = curses.newwin(3, win_w, h//2 - 1, (w - win_w)//2)
@@ -72,86 +377,882 @@ def draw_multi_popup(stdscr, title, options):
             if char == opt[1].lower(): return opt[1].lower()
         if ch in [27, ord('q')]: return 'c'
 
-# --- Logic & Review UI ---
+# --- Thumbnail Previews ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: read_ppm, preview_cell_style, draw_thumbnail.
+
+def read_ppm(path):
+    """Load a binary PPM (P6) image as (width, height, rgb_bytes)."""
+    with open(path, 'rb') as f: data = f.read()
+    parts = data.split(maxsplit=4)  # magic, width, height, maxval, pixels
+    if parts[0] != b"P6": raise ValueError(f"not a PPM: {path}")
+    w, h = int(parts[1]), int(parts[2])
+    return w, h, data[len(data) - w * h * 3:]
+
+def make_thumbnail(path):
+    """
+    Thumbnail for path from the disk cache, decoding it on a miss. Keyed by path, size and
+    mtime (like the freedesktop thumbnail spec), so a hit costs a stat rather than a read of the image.
+    """
+    st = os.stat(path)
+    key = hashlib.blake2b(f"{path}\0{st.st_size}\0{st.st_mtime_ns}".encode('utf-8', 'surrogateescape'), digest_size=16)
+    thumb_path = os.path.join(THUMB_DIR, key.hexdigest() + ".ppm")
+    if os.path.exists(thumb_path):
+        os.utime(thumb_path)  # mtime doubles as LRU recency
+        with METRICS.phase("thumb_load"): return read_ppm(thumb_path)
+    with METRICS.phase("thumb"), pillow().open(path) as im:
+        im.draft("RGB", (THUMB_SIZE * 2, THUMB_SIZE * 2))  # lets JPEG decode at reduced scale
+        im = im.convert("RGB"); im.thumbnail((THUMB_SIZE, THUMB_SIZE))
+        tmp = f"{thumb_path}.{threading.get_ident()}.tmp"
+        im.save(tmp, "PPM"); os.replace(tmp, thumb_path)
+        return im.width, im.height, im.tobytes()
+
+class ThumbnailCache:
+    """Generates thumbnails on a background pool; finished ones are kept in a small in-memory LRU."""
+    def __init__(self, workers=THUMB_WORKERS, keep=256):
+        from concurrent.futures import ThreadPoolExecutor  # deferred: only [p] needs it, and it is slow to import
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        self.pool, self.pending, self.ready, self.keep = ThreadPoolExecutor(workers), {}, OrderedDict(), keep
+        self.lock, self.writes = threading.Lock(), 0
+
+    def _work(self, path):
+        thumb = make_thumbnail(path)
+        with self.lock:
+            self.writes += 1
+            if self.writes % 50 == 0: self.evict()
+        return thumb
+
+    def request(self, path):
+        if path not in self.ready and path not in self.pending:
+            self.pending[path] = self.pool.submit(self._work, path)
+
+    def get(self, path):
+        """The (w, h, rgb) thumbnail, None while pending, or False if it could not be made."""
+        fut = self.pending.get(path)
+        if fut is not None and fut.done():
+            del self.pending[path]
+            try: self.ready[path] = fut.result()
+            except Exception: self.ready[path] = False
+            while len(self.ready) > self.keep: self.ready.popitem(last=False)
+        if path in self.ready:
+            self.ready.move_to_end(path); return self.ready[path]
+        return None
+
+    def busy(self):
+        return any(not f.done() for f in self.pending.values())
+
+    def evict(self):
+        """Trim the disk cache to THUMB_CACHE_MAX, oldest-used first."""
+        try:
+            files = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(THUMB_DIR) if e.name.endswith(".ppm")]
+        except OSError: return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= THUMB_CACHE_MAX: break
+            try: os.remove(path); total -= size
+            except OSError: pass
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+_preview_pairs = {}
+
+def preview_cell_style(r, g, b):
+    """Curses attr for one pixel: a 6x6x6-cube background colour, or None if the terminal lacks 256 colours."""
+    if curses.COLORS < 256 or curses.COLOR_PAIRS < 16 + 216: return None
+    cube = 16 + 36 * (r * 6 // 256) + 6 * (g * 6 // 256) + (b * 6 // 256)
+    pair = _preview_pairs.get(cube)
+    if pair is None:
+        pair = _preview_pairs[cube] = 16 + len(_preview_pairs)
+        curses.init_pair(pair, curses.COLOR_WHITE, cube)
+    return curses.color_pair(pair)
+
+def draw_thumbnail(stdscr, thumb, y, x, rows, cols):
+    """Render an image into a rows x cols cell box; falls back to an ASCII shade ramp without 256 colours."""
+    if not thumb:
+        stdscr.addstr(y, x, ("loading..." if thumb is None else "no preview")[:cols], curses.color_pair(1)); return
+    tw, th, rgb = thumb
+    scale = max(tw / cols, th / (rows * 2))  # a cell is about twice as tall as it is wide
+    out_w, out_h = max(1, int(tw / scale)), max(1, int(th / scale / 2))
+    ramp = " .:-=+*#%@"
+    for row in range(min(out_h, rows)):
+        py = min(th - 1, int(row * 2 * scale))
+        for col in range(min(out_w, cols)):
+            i = (py * tw + min(tw - 1, int(col * scale))) * 3
+            r, g, b = rgb[i], rgb[i + 1], rgb[i + 2]
+            style = preview_cell_style(r, g, b)
+            try:
+                if style is not None: stdscr.addstr(y + row, x + col, " ", style)
+                else: stdscr.addstr(y + row, x + col, ramp[(r * 30 + g * 59 + b * 11) * (len(ramp) - 1) // 25500])
+            except curses.error: pass
+
+# --- Compact Result Sets ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: DupResults.
+
+class DupResults:
+    """
+    Duplicate sets stored compactly for huge result sets: each folder path is
+    interned once, file names and set headers are packed into UTF-8 blobs, and
+    every boundary lives in a typed array, so a file costs a few dozen bytes
+    instead of a Python string per line. Indexing by row yields the same lines
+    as the old flat list (optional "--- ... ---" header, one row per path,
+    blank separator). File sizes are kept alongside (-1 until first needed,
+    then stat'ed once) for reclaimable-space accounting.
+    """
+    __slots__ = ("dirs", "dir_ids", "file_dirs", "name_blob", "name_ends", "label_blob", "label_ends",
+                 "offsets", "row_starts", "deleted", "sizes", "origin", "order", "rank")
+
+    def __init__(self):
+        self.dirs, self.dir_ids, self.file_dirs = [], {}, array('I')
+        self.name_blob, self.name_ends, self.deleted = bytearray(), array('Q', [0]), bytearray()
+        self.label_blob, self.label_ends = bytearray(), array('Q', [0])
+        self.offsets, self.row_starts = array('Q', [0]), array('Q', [0])
+        self.sizes, self.origin = array('q'), array('I')  # origin: each set's position in scan order
+        self.order, self.rank = array('I'), array('I')  # display order of the sets, and each set's place in it
+
+    def add_group(self, label, paths, sizes=None):
+        """Append a set; label is its header line (or None for no header), sizes its file sizes if known."""
+        if not paths: return
+        for p in paths:
+            cut = p.rfind('/') + 1
+            d = p[:cut]
+            did = self.dir_ids.get(d)
+            if did is None: did = self.dir_ids[d] = len(self.dirs); self.dirs.append(d)
+            self.file_dirs.append(did); self.deleted.append(0)
+            self.name_blob += p[cut:].encode('utf-8', 'surrogateescape'); self.name_ends.append(len(self.name_blob))
+        self.sizes.extend(sizes if sizes is not None else [-1] * len(paths))
+        if label: self.label_blob += label.encode('utf-8', 'surrogateescape')
+        self.rank.append(len(self.order)); self.order.append(len(self.origin)); self.origin.append(len(self.origin))
+        self.label_ends.append(len(self.label_blob)); self.offsets.append(self.offsets[-1] + len(paths))
+        self.row_starts.append(self.row_starts[-1] + bool(label) + len(paths) + 1)
+
+    @classmethod
+    def from_lines(cls, lines, default_label=None):
+        """Parse the flat text format (dups.txt or an old cache) without holding every line."""
+        results, label, paths = cls(), None, []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                results.add_group(label or default_label, paths, cls.header_sizes(label, paths)); label, paths = None, []
+            elif line.startswith("--- DELETED"): continue
+            elif line.startswith("---"):
+                if paths: results.add_group(label or default_label, paths, cls.header_sizes(label, paths)); paths = []
+                label = line
+            else: paths.append(line)
+        results.add_group(label or default_label, paths, cls.header_sizes(label, paths))
+        return results
+
+    @staticmethod
+    def header_sizes(label, paths):
+        """File sizes from an '--- EXACT COPIES: ... (N bytes each) ---' header, or None if it has none."""
+        each = re.search(r"\((\d+) bytes each\)", label or "")
+        return [int(each.group(1))] * len(paths) if each else None
+
+    def to_json(self):
+        return {"dirs": self.dirs, "file_dirs": self.file_dirs.tolist(), "offsets": self.offsets.tolist(),
+                "names": [self.name(i) for i in range(self.count())], "sizes": self.sizes.tolist(),
+                "labels": [self.label(g) for g in range(self.group_count())], "origin": self.origin.tolist(),
+                "deleted": [i for i, d in enumerate(self.deleted) if d]}
+
+    @classmethod
+    def from_json(cls, data):
+        results, dirs, names, offsets = cls(), data["dirs"], data["names"], data["offsets"]
+        sizes = data.get("sizes") or [-1] * len(names)
+        for g, label in enumerate(data["labels"]):
+            a, b = offsets[g], offsets[g + 1]
+            results.add_group(label, [dirs[data["file_dirs"][i]] + names[i] for i in range(a, b)], sizes[a:b])
+        for i in data.get("deleted", []): results.deleted[i] = 1
+        if "origin" in data: results.origin = array('I', data["origin"])
+        return results
+
+    def set_order(self, groups):
+        """Show the sets in the given order; only the per-set row table is rebuilt, files keep their numbers."""
+        self.order, self.rank, self.row_starts = array('I', groups), array('I', bytes(4 * len(groups))), array('Q', [0])
+        for n, g in enumerate(self.order):
+            self.rank[g] = n
+            self.row_starts.append(self.row_starts[-1] + (self.label_ends[g + 1] > self.label_ends[g]) + self.offsets[g + 1] - self.offsets[g] + 1)
+
+    def __len__(self):
+        """Number of display rows."""
+        return self.row_starts[-1]
+
+    def count(self):
+        """Number of files across all sets."""
+        return len(self.deleted)
+
+    def group_count(self):
+        return len(self.offsets) - 1
+
+    def name(self, i):
+        return self.name_blob[self.name_ends[i]:self.name_ends[i + 1]].decode('utf-8', 'surrogateescape')
+
+    def path(self, i):
+        return self.dirs[self.file_dirs[i]] + self.name(i)
+
+    def label(self, g):
+        """Header line of set g, or None."""
+        a, b = self.label_ends[g], self.label_ends[g + 1]
+        return self.label_blob[a:b].decode('utf-8', 'surrogateescape') if b > a else None
+
+    def size(self, i):
+        """Size of file i, stat'ed on first use and then cached (0 if it cannot be read)."""
+        if self.sizes[i] < 0:
+            try: self.sizes[i] = os.path.getsize(self.path(i))
+            except OSError: self.sizes[i] = 0
+        return self.sizes[i]
+
+    def reclaimable(self, g):
+        """Bytes freed by keeping only the largest remaining file of set g."""
+        live = [self.size(i) for i in self.members(g) if not self.deleted[i]]
+        return sum(live) - max(live) if live else 0
+
+    def by_savings(self):
+        """Set numbers, most reclaimable space first (scan order breaks ties)."""
+        return sorted(range(self.group_count()), key=lambda g: (-self.reclaimable(g), self.origin[g]))
+
+    def group_of(self, i):
+        return bisect.bisect_right(self.offsets, i) - 1
+
+    def members(self, g):
+        return range(self.offsets[g], self.offsets[g + 1])
+
+    def first(self):
+        """First file in display order."""
+        return self.offsets[self.order[0]] if self.order else 0
+
+    def step(self, i, d):
+        """The file d (+1 or -1) places after file i in display order, wrapping around."""
+        g = self.group_of(i)
+        if self.offsets[g] <= i + d < self.offsets[g + 1]: return i + d
+        g = self.order[(self.rank[g] + d) % len(self.order)]
+        return self.offsets[g] if d > 0 else self.offsets[g + 1] - 1
 
-def find_duplicates(stdscr, directory):
+    def member_row(self, i):
+        g = self.group_of(i)
+        return self.row_starts[self.rank[g]] + (self.label_ends[g + 1] > self.label_ends[g]) + i - self.offsets[g]
+
+    def locate(self, row):
+        """(set, file) for a display row; file is None on a header and -1 on the blank separator."""
+        n = bisect.bisect_right(self.row_starts, row) - 1; g = self.order[n]
+        k = row - self.row_starts[n] - (self.label_ends[g + 1] > self.label_ends[g])
+        if k < 0: return g, None
+        i = self.offsets[g] + k
+        return g, (i if i < self.offsets[g + 1] else -1)
+
+    def __getitem__(self, row):
+        g, i = self.locate(row)
+        if i is None: return self.label(g)
+        if i < 0: return ""
+        return f"--- DELETED: {self.path(i)} ---" if self.deleted[i] else self.path(i)
+
+# --- Review Filter ([/] in review) ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: SIZE_UNITS, parse_size, GroupFilter.
+
+SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+def parse_size(text):
+    """'10M' -> 10485760; None if text is not a size (yet)."""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    try: return int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+    except ValueError: return None
+
+class GroupFilter:
+    """
+    Incremental filter over a DupResults. A query is space separated terms that
+    must all hold for one file of a set:
+        word      in the folder or file name       dir:x   in the folder
+        ext:jp    extension starts with            re:pat  regex on the full path
+        >10M <2G  size range (K/M/G/T)
+    Matching sets are copied into `view` (a DupResults, so the review draws it
+    unchanged) in order and lazily: a keystroke only evaluates enough sets to
+    fill the screen and advance() finishes the rest in idle chunks. Lowercased
+    names, extensions and folders are computed once, and a query that only
+    narrows the previous one re-checks just the sets that matched before.
+    """
+    CHUNK = 5000
+
+    def __init__(self, results):
+        self.results = results
+        self.names = [results.name(i).lower() for i in range(results.count())]
+        self.exts = [sys.intern(os.path.splitext(n)[1][1:]) for n in self.names]
+        self.dirs = [d.lower() for d in results.dirs]
+        self.query, self.done, self.src = "", True, array('I', results.order)
+        self.view, self.hits = results, []
+
+    def compile(self, query):
+        r, names, exts, dirs, fdirs = self.results, self.names, self.exts, self.dirs, self.results.file_dirs
+        tests = []
+        for raw in query.split():
+            term = raw.lower()  # regexes keep their case: lowercasing turns \D \S \W \B into \d \s \w \b
+            if term.startswith("re:"):
+                pattern = re.compile(raw[3:], re.I)
+                tests.append(lambda i, p=pattern: p.search(r.path(i)))
+            elif term.startswith("dir:"): tests.append(lambda i, t=term[4:]: t in dirs[fdirs[i]])
+            elif term.startswith("ext:"): tests.append(lambda i, t=term[4:].lstrip('.'): exts[i].startswith(t))
+            elif term[0] in "<>":
+                limit = parse_size(term[1:])
+                if limit is None: continue  # still being typed
+                tests.append((lambda i, n=limit: r.size(i) > n) if term[0] == ">" else (lambda i, n=limit: r.size(i) < n))
+            else: tests.append(lambda i, t=term: t in names[i] or t in dirs[fdirs[i]])
+        return tests
+
+    @staticmethod
+    def kind(term):
+        for prefix in ("re:", "dir:", "ext:", "<", ">"):
+            if term.lower().startswith(prefix): return prefix
+        return "word"
+
+    def narrows(self, query):
+        """True if every set matching query also matched the (fully evaluated) previous one."""
+        if not self.done or not self.query.strip() or not query.startswith(self.query): return False
+        if query == self.query or self.query.endswith(" ") or query[len(self.query)] == " ": return True  # same, or one more term
+        old_last, new_last = self.query.split()[-1], query.split()[len(self.query.split()) - 1]
+        # Typing on into a substring/prefix can only shrink it; '<' and regexes can grow. A '>' bound
+        # narrows only if it rose: '>9e' does not parse (no test at all) and '>9e-3' is lower than '>9'.
+        if self.kind(old_last) != self.kind(new_last) or self.kind(old_last) in ("re:", "<"): return False
+        if self.kind(old_last) != ">": return True
+        old_n, new_n = parse_size(old_last[1:]), parse_size(new_last[1:])
+        return old_n is None or (new_n is not None and new_n >= old_n)
+
+    def set_query(self, query):
+        """Start evaluating query (raises re.error for a bad regex); call advance() to fill the view."""
+        tests = self.compile(query)
+        candidates = self.src if self.narrows(query) else array('I', self.results.order)
+        self.query, self.tests, self.candidates, self.pos, self.done = query, tests, candidates, 0, False
+        self.view, self.src, self.hits = DupResults(), array('I'), []
+
+    def advance(self, budget=CHUNK):
+        """Evaluate up to budget more sets; returns True once the whole query is done."""
+        r, tests, end = self.results, self.tests, min(len(self.candidates), self.pos + budget)
+        for g in self.candidates[self.pos:end]:
+            hits = [i for i in r.members(g) if not r.deleted[i] and all(t(i) for t in tests)]
+            if not hits: continue
+            a, b = r.offsets[g], r.offsets[g + 1]
+            self.view.add_group(r.label(g), [r.path(i) for i in range(a, b)], r.sizes[a:b])
+            self.view.deleted[a - b:] = r.deleted[a:b]
+            self.src.append(g); self.hits.append([self.view.count() - (b - i) for i in hits])
+        self.pos = end; self.done = end >= len(self.candidates)
+        return self.done
+
+    def base_file(self, i):
+        """The results file behind view file i."""
+        g = self.view.group_of(i)
+        return self.results.offsets[self.src[g]] + i - self.view.offsets[g]
+
+    def bulk_targets(self):
+        """View files matching the query, minus one copy (the largest) of any set it would empty."""
+        while not self.advance(): pass
+        targets, kept = [], 0
+        for g, hits in enumerate(self.hits):
+            hits = [i for i in hits if not self.view.deleted[i]]
+            live = [i for i in self.view.members(g) if not self.view.deleted[i]]
+            if hits and len(hits) == len(live):
+                hits.remove(max(hits, key=self.view.size)); kept += 1
+            targets.extend(hits)
+        return targets, kept
+
+# --- Scan Engine (shared by the browser and `dupImgBrowser.py scan`) ---
+
+def collect_images(roots):
+    """
+    Walk roots and bucket images by size. Returns ({size: [(path, root, mtime_ns, dev, ino)]}, {root: set(relpaths)}).
+    A path under several (nested) roots is claimed by the first root that reaches it.
+    """
+    by_size, seen, present = defaultdict(list), set(), {r: set() for r in roots}
+    with METRICS.phase("walk"):
+        for directory in roots:
+            prefix_len = len(directory.rstrip('/')) + 1
+            for root, _, files in os.walk(directory):
+                for f in files:
+                    if not f.lower().endswith(IMG_EXTS): continue
+                    path = os.path.join(root, f)
+                    if path in seen: continue
+                    try: st = os.stat(path)
+                    except OSError: continue
+                    seen.add(path); present[directory].add(path[prefix_len:])
+                    by_size[st.st_size].append((path, directory, st.st_mtime_ns, st.st_dev, st.st_ino))
+    METRICS.count("files_scanned", len(seen))
+    return by_size, present
+
+def load_hash_index(root):
+    """Stored {relpath: [size, mtime_ns, hash]} for root, or {} if missing or made with another hash mode."""
+    try:
+        with METRICS.phase("index_load"), open(os.path.join(root, INDEX_FILE), 'r') as f:
+            data = json.load(f)
+        return data.get("files", {}) if data.get("hash_mode") == hash_mode() else {}
+    except: return {}
+
+def save_hash_index(root, files):
+    try:
+        index_path = os.path.join(root, INDEX_FILE); tmp = index_path + ".tmp"
+        with METRICS.phase("index_save"), open(tmp, 'w') as f:
+            json.dump({"hash_mode": hash_mode(), "files": files}, f)
+        os.replace(tmp, index_path)
+    except: pass
+
+def hash_images(roots, progress=None, min_count=2):
+    """
+    Yield (size, [(path, root, mtime_ns, hash)]) for every size bucket holding at
+    least min_count images, as soon as the whole bucket is hashed (hash is None
+    for unreadable files). The default of 2 means only files sharing a size are
+    read. Hashes are looked up in (and saved back to) each root's INDEX_FILE,
+    so unchanged files are not read again. The files that do need reading go
+    in physical order (order_reads) with readahead hints.
+    progress(done, total) is called every 25 files.
+    """
+    if isinstance(roots, str): roots = [roots]
+    roots = list(dict.fromkeys(os.path.abspath(r) for r in roots))
+    by_size, present = collect_images(roots)
+    indexes = {r: load_hash_index(r) for r in roots}
+    prefix_len = {r: len(r.rstrip('/')) + 1 for r in roots}
+    buckets = [(size, entries) for size, entries in by_size.items() if len(entries) >= min_count]
+    total, changed = sum(len(entries) for _, entries in buckets), set()
+    hashes, pending, work, entries_of = {}, {}, [], dict(buckets)
+
+    def bucket(size):
+        return size, [(path, root, mtime_ns, hashes.get(path)) for path, root, mtime_ns, _, _ in entries_of[size]]
+
+    try:
+        for size, entries in buckets:
+            pending[size] = 0
+            for path, root, mtime_ns, dev, ino in entries:
+                rec = indexes[root].get(path[prefix_len[root]:])
+                if rec and rec[0] == size and rec[1] == mtime_ns: hashes[path] = rec[2]; METRICS.count("index_hits")
+                else: work.append((path, dev, ino)); pending[size] += 1
+            if not pending[size]: yield bucket(size)
+        done = total - len(work)
+        work = order_reads(work)
+        meta = {path: (size, root, mtime_ns) for size, entries in buckets for path, root, mtime_ns, _, _ in entries if pending[size]}
+        ahead = 0 if HASH_CONFIG["order"] == "walk" else PREFETCH_FILES
+        head = PREFETCH_BYTES if HASH_CONFIG["full"] else QUICK_HASH_BYTES
+        for path, _, _ in work[:ahead]: prefetch(path, head)
+        for n, (path, _, _) in enumerate(work):
+            if progress and done % 25 == 0: progress(done, total)
+            done += 1
+            if ahead and n + ahead < len(work): prefetch(work[n + ahead][0], head)
+            size, root, mtime_ns = meta[path]
+            img_hash = hashes[path] = get_image_hash(path)
+            if img_hash: indexes[root][path[prefix_len[root]:]] = [size, mtime_ns, img_hash]; changed.add(root)
+            pending[size] -= 1
+            if not pending[size]: yield bucket(size)
+        if progress: progress(total, total)
+    finally:
+        for root, files in indexes.items():
+            kept = {rel: rec for rel, rec in files.items() if rel in present[root]}
+            if root in changed or len(kept) != len(files): save_hash_index(root, kept)
+
+def scan_duplicates(roots, progress=None):
+    """Yield (hash, size, paths) for every duplicate set across all roots, bucket by bucket (see hash_images)."""
+    for size, entries in hash_images(roots, progress):
+        sets = defaultdict(list)
+        for path, _, _, img_hash in entries:
+            if img_hash: sets[img_hash].append(path)
+        for hsh, group in sets.items():
+            if len(group) > 1: yield hsh, size, group
+
+# --- Shards (scan each disk on its own, merge centrally) ---
+
+SHARD_FORMAT = 1
+
+def write_shard(roots, out_path, progress=None):
+    """
+    Hash every image under roots (not only same-size ones, since their twins may be
+    in another shard) into a self-contained shard file: path, size, mtime_ns and hash
+    per image, plus the hash mode and host. Returns the number of images written.
+    """
+    roots = list(dict.fromkeys(os.path.abspath(r) for r in roots))
+    tmp, files = out_path + ".tmp", []
+    with open(tmp, 'w') as f:  # opened first: a bad output path fails before the hashing, not after it
+        for size, entries in hash_images(roots, progress, min_count=1):
+            files.extend([path, size, mtime_ns, img_hash] for path, _, mtime_ns, img_hash in entries if img_hash)
+        shard = {"format": SHARD_FORMAT, "tool": "dupImgBrowser", "version": VERSION, "hash_mode": hash_mode(),
+                 "host": socket.gethostname(), "roots": roots, "created": time.time(), "files": files}
+        with METRICS.phase("shard_save"): json.dump(shard, f)
+    os.replace(tmp, out_path)
+    return len(files)
+
+def load_shard(path):
+    with METRICS.phase("shard_load"), open(path, 'r') as f:
+        shard = json.load(f)
+    if shard.get("tool") != "dupImgBrowser" or shard.get("format") != SHARD_FORMAT:
+        raise ValueError(f"{path}: not a dupImgBrowser shard (format {SHARD_FORMAT})")
+    return shard
+
+def merge_shards(shards):
+    """
+    Yield (hash, size, [(path, shard_no)]) for every duplicate set across shards, using only
+    the stored sizes and hashes. A path that several shards of one host share counts once.
+    """
+    modes = {shard["hash_mode"] for shard in shards}
+    if len(modes) > 1: raise ValueError(f"shards were made with different hash modes: {', '.join(sorted(modes))}")
+    groups, seen = defaultdict(list), set()
+    with METRICS.phase("merge"):
+        for n, shard in enumerate(shards):
+            for path, size, _, img_hash in shard["files"]:
+                key = (shard["host"], path)
+                if key in seen: continue
+                seen.add(key); groups[(size, img_hash)].append((path, n))
+    for (size, hsh), members in groups.items():
+        if len(members) > 1: yield hsh, size, members
+
+def ingest_query(incoming, shards, progress=None):
+    """
+    Check the images under incoming against archive shards; only incoming files are read.
+    Yields (path, status, matches): "present" (an archive file has the same size and hash;
+    matches are those copies), "near" (an archive file has the same leading 8k at another size,
+    e.g. a truncated or appended-to copy; matches are those files) or "new". Names are not
+    compared: cameras reuse IMG_0001.JPG on every card.
+    """
+    modes = {shard["hash_mode"] for shard in shards}
+    if len(modes) > 1: raise ValueError(f"shards were made with different hash modes: {', '.join(sorted(modes))}")
+    algo, _, limit = modes.pop().partition(":")
+    if algo not in HASH_ALGOS: raise ValueError(f"shards use '{algo}', which is not available here")
+    HASH_CONFIG.update(algo=algo, full=(limit == "full"))  # incoming files must hash the way the archive did
+    exact, by_hash = defaultdict(list), defaultdict(list)
+    with METRICS.phase("archive_load"):
+        for shard in shards:
+            for path, size, _, img_hash in shard["files"]:
+                exact[(size, img_hash)].append(path); by_hash[img_hash].append(path)
+    sizes = {size for size, _ in exact}
+    incoming_by_size, _ = collect_images([os.path.abspath(incoming)])
+    entries = [(path, size, dev, ino) for size, items in incoming_by_size.items() for path, _, _, dev, ino in items]
+    # A whole-file hash can only match at the same size; a leading-8k hash can also flag near copies.
+    hashes, work = {}, [(path, dev, ino) for path, size, dev, ino in entries if size in sizes or not HASH_CONFIG["full"]]
+    for done, (path, _, _) in enumerate(order_reads(work)):
+        if progress and done % 25 == 0: progress(done, len(work))
+        hashes[path] = get_image_hash(path)
+    if progress: progress(len(work), len(work))
+    for path, size, _, _ in sorted(entries):
+        img_hash = hashes.get(path)
+        if (size, img_hash) in exact: yield path, "present", exact[(size, img_hash)]; continue
+        near = by_hash.get(img_hash, []) if img_hash else []
+        yield (path, "near", near) if near else (path, "new", [])
+
+def root_of(path, roots):
+    """The most specific root containing path, or None."""
+    best = None
+    for r in roots:
+        if path.startswith(r.rstrip('/') + '/') and (best is None or len(r) > len(best)): best = r
+    return best
+
+def group_results(groups):
+    """Pack (hash, size, paths) sets into a DupResults for review."""
+    results = DupResults()
+    for hsh, size, paths in groups: results.add_group(f"--- SET: {hsh} ---", paths, [size] * len(paths))
+    return results
+
+def load_scan_cache(directory):
+    """Returns cached DupResults if the folder timestamp is unchanged, else None."""
     cache_path = os.path.join(directory, CACHE_FILE)
-    dir_mtime = os.path.getmtime(directory)
-    
-    # Check Cache
-    if os.path.exists(cache_path):
+    if not os.path.exists(cache_path): return None
+    try:
+        with METRICS.phase("cache_load"), open(cache_path, 'r') as f:
+            cache_data = json.load(f)
+        if cache_data.get("mtime") == os.path.getmtime(directory) and cache_data.get("hash_mode", "md5:8192") == hash_mode():
+            METRICS.count("cache_hits")
+            if "results" in cache_data: return DupResults.from_json(cache_data["results"])
+            return DupResults.from_lines(cache_data.get("lines", []))  # cache from before v.0.2.24
+    except: pass
+    return None
+
+def folder_names(directory):
+    """Top-level names in directory other than this tool's own index and cache files."""
+    try: return set(os.listdir(directory)) - {CACHE_FILE, INDEX_FILE, INDEX_FILE + ".tmp"}
+    except OSError: return None
+
+def save_scan_cache(directory, results, dir_mtime=None):
+    try:
+        cache_path, current = os.path.join(directory, CACHE_FILE), dir_mtime is None
+        for _ in range(2):
+            if current: dir_mtime = os.path.getmtime(directory)
+            with METRICS.phase("cache_save"), open(cache_path, 'w') as f:
+                json.dump({"mtime": dir_mtime, "hash_mode": hash_mode(), "results": results.to_json()}, f)
+            # Creating the cache file bumps the folder mtime; rewrite once in place so it still matches.
+            if not current or os.path.getmtime(directory) == dir_mtime: break
+    except: pass
+
+# --- Watch Mode (inotify via ctypes, polling fallback) ---
+
+IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x8, 0x40, 0x80, 0x100, 0x200
+IN_DELETE_SELF, IN_Q_OVERFLOW, IN_ISDIR = 0x400, 0x4000, 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+WATCH_SETTLE = 1.0               # seconds of quiet before a batch of changes is applied
+POLL_INTERVAL = 30               # rescan period when inotify is unavailable
+
+class TreeWatcher:
+    """
+    Recursive watch over roots for files ending in exts. Uses Linux inotify through
+    ctypes, or rescans every POLL_INTERVAL seconds where that is unavailable.
+    batches() yields (changed, removed) path sets; removed entries ending in '/'
+    are whole directories, and (None, None) means events were lost (rescan).
+    """
+    def __init__(self, roots, exts):
+        self.roots, self.exts, self.wds, self.fd = roots, exts, {}, -1
         try:
-            with open(cache_path, 'r') as f:
-                cache_data = json.load(f)
-                if cache_data.get("mtime") == dir_mtime:
-                    return cache_data.get("lines", [])
-        except: pass
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+            for r in roots: self.add_tree(r)
+        except (OSError, AttributeError) as e:
+            if self.fd >= 0: os.close(self.fd); self.fd = -1
+            print(f"[watch] inotify unavailable ({e}); polling every {POLL_INTERVAL}s", file=sys.stderr)
+        if self.fd < 0: self.snapshot = self.scan_tree()
+
+    @property
+    def mode(self):
+        return f"inotify ({len(self.wds)} dirs)" if self.fd >= 0 else f"poll every {POLL_INTERVAL}s"
+
+    def add_tree(self, top):
+        """Watch top and everything below it; returns the matching files already inside."""
+        found = []
+        for root, _, files in os.walk(top):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC: raise OSError(err, "out of inotify watches (raise fs.inotify.max_user_watches)")
+                continue
+            self.wds[wd] = root
+            found += [os.path.join(root, f) for f in files if f.lower().endswith(self.exts)]
+        return found
+
+    def scan_tree(self):
+        snap = {}
+        for top in self.roots:
+            for root, _, files in os.walk(top):
+                for f in files:
+                    if not f.lower().endswith(self.exts): continue
+                    path = os.path.join(root, f)
+                    try: st = os.stat(path); snap[path] = (st.st_size, st.st_mtime_ns)
+                    except OSError: pass
+        return snap
+
+    def read_events(self, timeout):
+        """(changed, removed) from the next read of the inotify fd, None if quiet for timeout, 'overflow' if events were lost."""
+        if not select.select([self.fd], [], [], timeout)[0]: return None
+        data, off, changed, removed = os.read(self.fd, 1 << 16), 0, set(), set()
+        while off < len(data):
+            wd, mask, _, length = struct.unpack_from("iIII", data, off)
+            name = data[off + 16:off + 16 + length].split(b"\0", 1)[0]; off += 16 + length
+            if mask & IN_Q_OVERFLOW: return "overflow"
+            base = self.wds.get(wd)
+            if base is None: continue
+            path = os.path.join(base, os.fsdecode(name)) if name else base
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO): changed.update(self.add_tree(path))
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    prefix = path + os.sep; removed.add(prefix)
+                    for k in [k for k, d in self.wds.items() if d == path or d.startswith(prefix)]: del self.wds[k]
+            elif mask & IN_DELETE_SELF: self.wds.pop(wd, None)
+            elif name and path.lower().endswith(self.exts):
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO): changed.add(path); removed.discard(path)
+                elif mask & (IN_MOVED_FROM | IN_DELETE): removed.add(path); changed.discard(path)
+        return changed, removed
+
+    def batches(self):
+        while True:
+            if self.fd < 0:
+                time.sleep(POLL_INTERVAL)
+                new = self.scan_tree()
+                changed = {p for p, sig in new.items() if self.snapshot.get(p) != sig}
+                removed = set(self.snapshot) - set(new); self.snapshot = new
+                if changed or removed: yield changed, removed
+                continue
+            changed, removed, lost, timeout = set(), set(), False, None
+            while True:  # block for the first event, then collect until WATCH_SETTLE of quiet
+                ev = self.read_events(timeout)
+                if ev is None: break
+                if ev == "overflow": lost = True
+                else: changed = (changed - ev[1]) | ev[0]; removed = (removed - ev[0]) | ev[1]
+                timeout = WATCH_SETTLE
+            if lost: yield None, None
+            elif changed or removed: yield changed, removed
+
+class LiveIndex:
+    """In-memory size/hash model of the roots that watch mode updates one path at a time."""
+    def __init__(self, roots):
+        self.roots, self.files, self.by_size = roots, {}, defaultdict(set)
+        self.prefix_len = {r: len(r.rstrip('/')) + 1 for r in roots}
+        self.rescan()
+
+    def rescan(self):
+        by_size, present = collect_images(self.roots)
+        self.files.clear(); self.by_size.clear()
+        self.indexes = {r: {rel: rec for rel, rec in load_hash_index(r).items() if rel in present[r]} for r in self.roots}
+        for size, entries in by_size.items():
+            for path, root, mtime_ns, _, _ in entries:
+                self.files[path] = (root, size, mtime_ns); self.by_size[size].add(path)
+        self.dirty = set(self.roots)
+
+    def remove(self, path, forget=True):
+        """Drop path (or everything under a 'dir/' prefix); forget=False keeps its stored hash for revalidation."""
+        if path.endswith(os.sep):
+            for p in [p for p in self.files if p.startswith(path)]: self.remove(p)
+            return
+        rec = self.files.pop(path, None)
+        if rec is None: return
+        root, size, _ = rec
+        self.by_size[size].discard(path)
+        if not self.by_size[size]: del self.by_size[size]
+        if forget: self.indexes[root].pop(path[self.prefix_len[root]:], None); self.dirty.add(root)
+
+    def update(self, path):
+        self.remove(path, forget=False)
+        root = root_of(path, self.roots)
+        try: st = os.stat(path)
+        except OSError: return
+        if root is None: return
+        self.files[path] = (root, st.st_size, st.st_mtime_ns); self.by_size[st.st_size].add(path); self.dirty.add(root)
+
+    def hash_of(self, path):
+        root, size, mtime_ns = self.files[path]
+        rel = path[self.prefix_len[root]:]
+        rec = self.indexes[root].get(rel)
+        if rec and rec[0] == size and rec[1] == mtime_ns: return rec[2]
+        img_hash = get_image_hash(path)
+        if img_hash: self.indexes[root][rel] = [size, mtime_ns, img_hash]; self.dirty.add(root)
+        return img_hash
+
+    def groups(self):
+        """Current (hash, size, paths) duplicate sets; only same-size files are ever hashed."""
+        for size, paths in self.by_size.items():
+            if len(paths) < 2: continue
+            hashes = defaultdict(list)
+            for path in sorted(paths):
+                img_hash = self.hash_of(path)
+                if img_hash: hashes[img_hash].append(path)
+            for hsh, group in hashes.items():
+                if len(group) > 1: yield hsh, size, group
+
+    def save(self):
+        """Write the index and the root's own duplicate sets for every root touched since the last save."""
+        groups = list(self.groups())
+        for root in self.dirty:
+            save_hash_index(root, self.indexes[root])
+            local = [(h, size, [p for p in paths if self.files[p][0] == root]) for h, size, paths in groups]
+            save_scan_cache(root, group_results(g for g in local if len(g[2]) > 1))
+        self.dirty.clear()
+        return groups
+
+def watch_duplicates(roots):
+    """Keep each root's .img_hash_index and .img_dups_cache current until interrupted."""
+    roots = list(dict.fromkeys(os.path.abspath(r) for r in roots))
+    watcher = TreeWatcher(roots, IMG_EXTS)  # watches go in before the initial walk so nothing slips by
+    live = LiveIndex(roots)
+    groups = live.save()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # let `kill`/systemd stop it cleanly
+    print(f"[watch] {len(live.files)} images, {len(groups)} duplicate sets; {watcher.mode}", file=sys.stderr)
+    try:
+        for changed, removed in watcher.batches():
+            with METRICS.phase("watch_batch"):
+                if changed is None: live.rescan()
+                else:
+                    for path in removed: live.remove(path)
+                    for path in changed: live.update(path)
+                groups = live.save()
+            print(f"[watch] {time.strftime('%H:%M:%S')} {'rescan' if changed is None else f'+{len(changed)} -{len(removed)}'}"
+                  f" -> {len(live.files)} images, {len(groups)} duplicate sets", file=sys.stderr)
+    except (KeyboardInterrupt, SystemExit):
+        live.save()
+
+# --- Logic & Review UI ---
+
+def find_duplicates(stdscr, roots):
+    """Scan one folder or a list of roots; a single root's results are cached in the folder."""
+    if isinstance(roots, str): roots = [roots]
+    directory = roots[0] if len(roots) == 1 else None
+    if directory:
+        cached = load_scan_cache(directory)
+        if cached is not None: return cached
+        dir_mtime, names = os.path.getmtime(directory), folder_names(directory)
 
     stdscr.clear(); h, w = stdscr.getmaxyx()
     stdscr.addstr(h//2, (w-20)//2, "Scanning images...", curses.A_BOLD); stdscr.refresh()
-    
-    hashes = defaultdict(list)
-    image_files = []
-    for root, _, files in os.walk(directory):
-        for f in files:
-            if f.lower().endswith(IMG_EXTS):
-                image_files.append(os.path.join(root, f))
-    
-    total = len(image_files)
-    if total == 0: return []
 
-    for idx, path in enumerate(image_files):
-        if idx % 25 == 0:
-            stdscr.addstr(h//2 + 1, (w-30)//2, f"Processed: {idx}/{total}"); stdscr.refresh()
-        img_hash = get_image_hash(path)
-        if img_hash: hashes[img_hash].append(path)
-            
-    output_lines = []
-    for hsh, paths in hashes.items():
-        if len(paths) > 1:
-            output_lines.append(f"--- SET: {hsh} ---")
-            for p in paths: output_lines.append(p)
-            output_lines.append("")
-            
-    # Save Cache
-    try:
-        with open(cache_path, 'w') as f:
-            json.dump({"mtime": dir_mtime, "lines": output_lines}, f)
-    except: pass
+    def progress(done, total):
+        stdscr.addstr(h//2 + 1, (w-30)//2, f"Processed: {done}/{total}"); stdscr.refresh()
 
-    return output_lines
+    results = group_results(scan_duplicates(roots, progress))
+    if directory:
+        # Writing the hash index bumps the folder mtime too; if nothing else came or went during the
+        # scan, store the mtime as it is now so the next launch hits the cache.
+        save_scan_cache(directory, results, None if folder_names(directory) == names else dir_mtime)
+    return results
 
-def review_duplicates(stdscr, lines, base_dir):
-    if not lines:
+def review_duplicates(stdscr, results, base_dirs, select=None):
+    """Review duplicate sets; select is a path to put the cursor on (a restored session)."""
+    if not results.count():
         draw_status(stdscr, "No duplicates found."); return
         
     curses.init_pair(3, curses.COLOR_CYAN, curses.COLOR_BLACK)
     curses.init_pair(4, curses.COLOR_BLACK, curses.COLOR_CYAN)
     
-    selectable_indices = [i for i, line in enumerate(lines) if line.strip() and not line.strip().startswith("---")]
-    sel_idx, start_index = 0, 0
-    base_dir_abs = os.path.abspath(base_dir).rstrip('/') + '/'
+    # Biggest savings first; [s] flips back to scan order. Sizes come from the scan, not fresh stats.
+    base, by_savings = results, True; base.set_order(base.by_savings())
+    reclaimable = sum(base.reclaimable(g) for g in range(base.group_count()))
+    sel_idx, start_index = base.first(), 0  # sel_idx is a file number in the shown results; rows are derived from it
+    if select: sel_idx = next((i for i in range(base.count()) if base.path(i) == select), sel_idx)
+    if isinstance(base_dirs, str): base_dirs = [base_dirs]
+    base_dirs = [os.path.abspath(d) for d in base_dirs]
+    # With several roots each copy is tagged [n] with the root it lives in.
+    root_tags = {d: f"[{n}] " for n, d in enumerate(base_dirs, 1)} if len(base_dirs) > 1 else {base_dirs[0]: ""}
+    legend = "  ".join(f"{tag}{d}" for d, tag in root_tags.items()) if len(base_dirs) > 1 else ""
+    thumbs, show_previews = None, False
+    filt, query, typing, filter_error = None, "", False, ""  # [/] filter; the shown list is filt.view while query is set
+
+    def invalidate_caches():
+        for base_dir in base_dirs:
+            cache_path = os.path.join(base_dir, CACHE_FILE)
+            if os.path.exists(cache_path): os.remove(cache_path)
+
+    def top():
+        return (filt.view if filt is not None and query.strip() else base).first()
+
+    def apply_filter():
+        nonlocal filt, filter_error
+        if not query.strip(): filter_error = ""; return
+        if filt is None:
+            draw_status(stdscr, "Indexing names for the filter...", 0); filt = GroupFilter(base)
+        try: filt.set_query(query); filter_error = ""
+        except re.error as e: filter_error = f"bad regex: {e}"; return
+        deadline = time.perf_counter() + 0.03  # fill the first screen now, the rest while idle
+        while not filt.advance(200) and filt.view.group_count() < stdscr.getmaxyx()[0] and time.perf_counter() < deadline: pass
     
     while True:
-        stdscr.clear(); h, w = stdscr.getmaxyx()
-        current_selection = selectable_indices[sel_idx]
-        if current_selection < start_index: start_index = current_selection
-        elif current_selection >= start_index + (h-2): start_index = current_selection - (h-2) + 1
+        draw_t0 = time.perf_counter()
+        filtering = filt is not None and bool(query.strip())
+        results = filt.view if filtering else base
+        busy = filtering and not filt.done
+        # Kept in SESSION so a session that ends here (Ctrl-C, hangup) reopens on this file.
+        SESSION["review"] = {"roots": base_dirs, "file": results.path(sel_idx) if results.count() else None}
+        SESSION["results"] = base
+        stdscr.erase() if show_previews or busy else stdscr.clear(); h, w = stdscr.getmaxyx()
+        list_h = h // 2 if show_previews else h - 1  # previews take the bottom half of the screen
+        current_selection = results.member_row(sel_idx) if results.count() else -1
+        if current_selection < start_index: start_index = max(0, current_selection)
+        elif current_selection >= start_index + (list_h-1): start_index = current_selection - (list_h-1) + 1
         
-        stdscr.addstr(0, 0, f" Reviewing Duplicate Images ".ljust(w-1)[:w-1], curses.color_pair(2))
-        for i in range(h-2):
+        title = (f" Reviewing Duplicate Images {legend} [s] Sort: {'savings' if by_savings else 'scan order'} [p] Previews [/] Filter"
+                 f" | Reclaimable {human_size(reclaimable)} | Freed this session {human_size(SESSION['reclaimed'])} ")
+        stdscr.addstr(0, 0, title.ljust(w-1)[:w-1], curses.color_pair(2))
+        for i in range(list_h-1):
             idx = i + start_index
-            if idx >= len(lines): break
-            content = lines[idx]
+            if idx >= len(results): break
+            content = results[idx]; g, f = results.locate(idx)
             is_selected = (idx == current_selection)
             prefix = "> " if is_selected else "  "
+            root = None if content.startswith("---") else root_of(content, base_dirs)
+            if f is not None and f >= 0: prefix += f"{human_size(results.size(f)):>9}  "
+            if root: prefix += root_tags[root]
+            if f is None: content += f"  [{sum(not results.deleted[m] for m in results.members(g))} files, {human_size(results.reclaimable(g))} reclaimable]"
             full_line = f"{prefix}{content}"
 
             if not content.strip() or content.startswith("---"):
                 stdscr.addstr(i + 1, 0, full_line[:w-1].ljust(w-1)[:w-1], curses.color_pair(1))
-            elif content.startswith(base_dir_abs):
+            elif root:
                 # Highlighting logic like Video Browser
-                split_point = len(prefix) + len(base_dir_abs)
+                split_point = len(prefix) + len(root.rstrip('/')) + 1
                 stdscr.addstr(i + 1, 0, full_line[:split_point][:w-1], curses.color_pair(2) if is_selected else curses.color_pair(1))
                 if split_point < w-1:
                     style = (curses.color_pair(4) | curses.A_BOLD) if is_selected else (curses.color_pair(3) | curses.A_BOLD)
@@ -160,95 +1261,294 @@ def review_duplicates(stdscr, lines, base_dir):
                 style = curses.color_pair(2) if is_selected else curses.color_pair(1)
                 stdscr.addstr(i + 1, 0, full_line[:w-1].ljust(w-1)[:w-1], style)
         
-        stdscr.refresh(); ch = stdscr.getch()
+        if show_previews and results.count():
+            group = results.group_of(sel_idx)
+            at = results.rank[group]
+            for near in results.order[max(0, at - PREFETCH_SETS):at + PREFETCH_SETS + 1]:
+                for m in results.members(near):
+                    if not results.deleted[m]: thumbs.request(results.path(m))
+            members = [m for m in results.members(group) if not results.deleted[m]]
+            if members:
+                cols = max(8, (w - 1) // len(members)); top = list_h + 1
+                for n, m in enumerate(members[:max(1, (w - 1) // 8)]):
+                    x = n * cols
+                    style = curses.color_pair(2) if m == sel_idx else curses.color_pair(1)
+                    stdscr.addstr(list_h, x, f" {results.name(m)} ".ljust(cols - 1)[:cols - 1], style)
+                    draw_thumbnail(stdscr, thumbs.get(results.path(m)), top, x, h - top - 1, cols - 1)
+        if typing or filtering:
+            matched = f"{filt.view.group_count()}{'+' if busy else ''} sets" if filtering else ""
+            hint = "[Enter] Keep [Esc] Clear" if typing else "[/] Edit [Esc] Clear [D] Delete matches"
+            stdscr.addstr(h-1, 0, f"/{query}{'_' if typing else ''}  {filter_error or matched}  {hint}".ljust(w-1)[:w-1], curses.color_pair(2))
+        stdscr.timeout(0 if busy else 150 if show_previews and thumbs.busy() else -1)  # idle ticks finish the filter / land thumbnails
+
+        stdscr.refresh(); METRICS.add("draw", time.perf_counter() - draw_t0, 1); ch = stdscr.getch()
         char = chr(ch).lower() if 0 <= ch < 256 else ""
         
-        if ch in [ord('q'), 27, ord('h')]: break
-        elif ch in [curses.KEY_UP, ord('k')]: sel_idx = (sel_idx - 1) % len(selectable_indices)
-        elif ch in [curses.KEY_DOWN, ord('j')]: sel_idx = (sel_idx + 1) % len(selectable_indices)
-        elif ch in [10, 13, ord('l')]: 
-            curr = lines[current_selection].strip()
+        if ch == -1:
+            if busy: filt.advance()
+            continue
+        elif typing and ch not in [curses.KEY_UP, curses.KEY_DOWN]:
+            if ch in [10, 13]: typing = False
+            elif ch == 27: typing, query, filter_error = False, "", ""; sel_idx, start_index = base.first(), 0
+            elif ch in [curses.KEY_BACKSPACE, 127, 8]: query = query[:-1]; apply_filter(); sel_idx, start_index = top(), 0
+            elif 32 <= ch < 127: query += chr(ch); apply_filter(); sel_idx, start_index = top(), 0
+        elif ch == 27 and filtering: query, filter_error = "", ""; sel_idx, start_index = base.first(), 0
+        elif ch in [ord('q'), 27, ord('h')]: break
+        elif ch == ord('/'): typing = True
+        elif char == 'p':
+            if pillow() is None: draw_status(stdscr, "Previews need Pillow (pip install Pillow)."); continue
+            show_previews = not show_previews
+            if show_previews and thumbs is None: thumbs = ThumbnailCache()
+        elif char == 's':
+            # Only the set order changes, so the file numbers (and the selection) stay put.
+            base.set_order(sorted(range(base.group_count()), key=lambda n: base.origin[n]) if by_savings else base.by_savings())
+            by_savings = not by_savings
+            if filtering: filt.query = ""; apply_filter(); sel_idx, start_index = top(), 0  # re-run in the new order
+        elif ch == ord('D') and filtering:
+            targets, kept = filt.bulk_targets()
+            if not targets: draw_status(stdscr, "Nothing left to delete in this view."); continue
+            nbytes = sum(filt.view.size(i) for i in targets)
+            if not draw_popup_confirm(stdscr, f"Delete {len(targets)} matching files ({human_size(nbytes)})? {kept} sets keep one copy."): continue
+            errors = 0
+            for i in targets:
+                bi = filt.base_file(i); g = base.group_of(bi); before = base.reclaimable(g)
+                try: os.remove(base.path(bi))
+                except OSError: errors += 1; continue
+                base.deleted[bi] = filt.view.deleted[i] = 1
+                reclaimable -= before - base.reclaimable(g)
+                SESSION["reclaimed"] += base.size(bi); SESSION["deleted"] += 1
+            invalidate_caches()
+            draw_status(stdscr, f"Deleted {len(targets) - errors} files ({errors} failed). Freed {human_size(SESSION['reclaimed'])} this session.", 1.5)
+        elif not results.count(): continue
+        elif ch in [curses.KEY_UP, ord('k')]: sel_idx = results.step(sel_idx, -1)
+        elif ch in [curses.KEY_DOWN, ord('j')]: sel_idx = results.step(sel_idx, 1)
+        elif ch in [10, 13, ord('l')] and not results.deleted[sel_idx]:
+            curr = results.path(sel_idx)
             choice = draw_multi_popup(stdscr, "Action:", ["[v] View Image", "[d] Delete", "[c] Cancel"])
             if choice == 'v':
                 subprocess.run(['xdg-open', curr], stderr=subprocess.DEVNULL)
             elif choice == 'd' and draw_popup_confirm(stdscr, f"Delete: {os.path.basename(curr)}?"):
                 try: 
-                    os.remove(curr); lines[current_selection] = f"--- DELETED: {curr} ---"
-                    # Invalidate cache file after a delete
-                    cache_path = os.path.join(base_dir, CACHE_FILE)
-                    if os.path.exists(cache_path): os.remove(cache_path)
-                    draw_status(stdscr, "File removed.")
+                    bi = filt.base_file(sel_idx) if filtering else sel_idx
+                    g = base.group_of(bi); before = base.reclaimable(g)
+                    os.remove(curr); base.deleted[bi] = results.deleted[sel_idx] = 1
+                    reclaimable -= before - base.reclaimable(g)
+                    SESSION["reclaimed"] += base.size(bi); SESSION["deleted"] += 1
+                    invalidate_caches()  # the cached scan still lists the file
+                    draw_status(stdscr, f"File removed. Freed {human_size(SESSION['reclaimed'])} this session.")
                 except Exception as e: draw_status(stdscr, f"Error: {str(e)}")
+    stdscr.timeout(-1); SESSION["review"] = SESSION["results"] = None
+    if thumbs: thumbs.close()
 
-def image_browser(stdscr):
+def image_browser(stdscr, roots=None, fresh=False):
     curses.start_color()
     curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_BLACK, curses.COLOR_GREEN)
     curses.curs_set(0)
     
-    current_path = os.path.abspath(os.getcwd())
+    launch_dir = current_path = os.path.abspath(os.getcwd())
     selection, start_index, show_hidden = 0, 0, False
     conn_info = get_connection_info()
     needs_refresh = True
-    entries = []
+    entries, dir_set, listed_mtime, check, select_name, loading = [], set(), 0, None, None, None
+    marked = list(dict.fromkeys(os.path.abspath(r) for r in roots or []))  # roots for a multi-root scan
 
-    while True:
-        if needs_refresh:
-            try:
-                items = os.listdir(current_path)
-                if not show_hidden: items = [i for i in items if not i.startswith('.')]
-                dirs = sorted([d for d in items if os.path.isdir(os.path.join(current_path, d))], key=str.lower)
-                files = sorted([f for f in items if not os.path.isdir(os.path.join(current_path, f))], key=str.lower)
-                entries = ([".."] if current_path != "/" else []) + dirs + files
-            except: entries = [".. [Error]"]
-            needs_refresh = False
-
-        stdscr.clear(); h, w = stdscr.getmaxyx()
-        if selection >= len(entries): selection = max(0, len(entries)-1)
-        if selection < start_index: start_index = selection
-        elif selection >= start_index + (h-2): start_index = selection - (h-2) + 1
-        
-        stdscr.addstr(0, 0, f" {conn_info} | {current_path} ".ljust(w-1)[:w-1], curses.color_pair(2))
-        for i, entry in enumerate(entries[start_index : start_index + (h-2)]):
-            idx = i + start_index
-            style = curses.color_pair(2) if idx == selection else curses.color_pair(1)
-            is_dir = os.path.isdir(os.path.join(current_path, entry)) or entry == ".."
-            label = f"[ {entry} ]" if is_dir else f"  {entry}"
-            stdscr.addstr(i + 1, 0, f"{'> ' if idx == selection else '  '}{label}"[:w-1].ljust(w-1)[:w-1], style)
+    # Started from the same place as last time (and not for a --root scan): come back to the same
+    # folder, cursor, marked roots and review. The stored listing is drawn at once and checked
+    # against the folder's mtime in the background; the review's results load in the background too.
+    state = {} if fresh or marked else load_session()
+    if state.get("launch_dir") != launch_dir: state = {}
+    if state.get("path"):
+        current_path, show_hidden, marked = state["path"], state.get("show_hidden", False), state.get("marked", [])
+        start_index, select_name = state.get("start_index", 0), state.get("selected")
+        if state.get("entries") is not None:
+            entries, dir_set, listed_mtime = state["entries"], set(state["dirs"]), state["mtime_ns"]
+            needs_refresh, check = False, ListingCheck(current_path, listed_mtime, show_hidden)
+            if select_name in entries: selection = entries.index(select_name)
+            select_name = None
+        if state.get("review"): loading = ReviewLoad(state["review"])
 
-        stdscr.addstr(h-1, 0, f" [4] Hidden [q] Quit | {VERSION} ".ljust(w-1), curses.color_pair(2))
-        stdscr.refresh()
-        
-        key = stdscr.getch()
-        char = chr(key).lower() if 0 <= key < 256 else ""
-        
-        if key == ord('q'): break
-        elif key in [curses.KEY_UP, ord('k')]: selection = (selection - 1) % len(entries)
-        elif key in [curses.KEY_DOWN, ord('j')]: selection = (selection + 1) % len(entries)
-        elif char == 'h' and current_path != "/":
-            current_path = os.path.dirname(current_path); selection = 0; needs_refresh = True
-        elif char == 'l':
-            target = os.path.join(current_path, entries[selection])
-            if os.path.isdir(target):
-                current_path = target; selection = 0; needs_refresh = True
-            elif entries[selection] == "..":
-                current_path = os.path.dirname(current_path); selection = 0; needs_refresh = True
-        elif key in [10, 13]: # ENTER
-            target = os.path.join(current_path, entries[selection])
-            if os.path.isdir(target) and entries[selection] != "..":
-                choice = draw_multi_popup(stdscr, "Image Folder Action:", ["[s] Scan for Duplicates", "[c] Cancel"])
-                if choice == 's':
-                    results = find_duplicates(stdscr, target)
-                    review_duplicates(stdscr, results, target)
-                    needs_refresh = True
-            elif entries[selection] == "..":
+    def session_state():
+        small = len(entries) <= SNAPSHOT_MAX
+        return {"launch_dir": launch_dir, "path": current_path, "show_hidden": show_hidden, "marked": marked,
+                "selected": entries[selection] if selection < len(entries) else None, "start_index": start_index,
+                "entries": entries if small else None, "dirs": sorted(dir_set) if small else None,
+                "mtime_ns": listed_mtime, "review": SESSION.get("review")}
+
+    try:
+        if marked and not state:
+            review_duplicates(stdscr, find_duplicates(stdscr, marked), marked)
+
+        while True:
+            if needs_refresh:
+                try: entries, dir_set, listed_mtime = list_dir(current_path, show_hidden)
+                except: entries, dir_set, listed_mtime = [".. [Error]"], set(), 0
+                needs_refresh, check = False, None
+                if select_name in entries: selection = entries.index(select_name)
+                select_name = None
+                save_session(session_state())
+            elif check and check.done:
+                # The restored snapshot was stale: swap in the fresh listing, keeping the cursor on the same name.
+                if check.result:
+                    name = entries[selection] if selection < len(entries) else None
+                    entries, dir_set, listed_mtime = check.result
+                    selection = entries.index(name) if name in entries else min(selection, len(entries)-1)
+                check = None
+            if loading and loading.done:
+                review, results, loading = loading.review, loading.result, None
+                if results is None: draw_status(stdscr, "The last review is out of date - scan again to reopen it.")
+                else: review_duplicates(stdscr, results, review["roots"], select=review.get("file")); needs_refresh = True
+                continue
+
+            draw_t0 = time.perf_counter()
+            stdscr.clear(); h, w = stdscr.getmaxyx()
+            if selection >= len(entries): selection = max(0, len(entries)-1)
+            if selection < start_index: start_index = selection
+            elif selection >= start_index + (h-2): start_index = selection - (h-2) + 1
+
+            stdscr.addstr(0, 0, f" {conn_info} | {current_path} ".ljust(w-1)[:w-1], curses.color_pair(2))
+            for i, entry in enumerate(entries[start_index : start_index + (h-2)]):
+                idx = i + start_index
+                style = curses.color_pair(2) if idx == selection else curses.color_pair(1)
+                is_dir = entry in dir_set or entry == ".."
+                label = f"[ {entry} ]" if is_dir else f"  {entry}"
+                if is_dir and os.path.join(current_path, entry) in marked: label += " *root"
+                stdscr.addstr(i + 1, 0, f"{'> ' if idx == selection else '  '}{label}"[:w-1].ljust(w-1)[:w-1], style)
+
+            stdscr.addstr(h-1, 0, f" [m] Mark root ({len(marked)}) [4] Hidden [q] Quit | {VERSION} ".ljust(w-1)[:w-1], curses.color_pair(2))
+            stdscr.refresh(); METRICS.add("draw", time.perf_counter() - draw_t0, 1)
+
+            stdscr.timeout(50 if check or loading else -1)  # keep polling the background listing/review loads
+            key = stdscr.getch()
+            if key == -1: continue
+            loading = None  # a key pressed before the old review loaded: the user has moved on
+            char = chr(key).lower() if 0 <= key < 256 else ""
+
+            if key == ord('q'): SESSION["review"] = SESSION["results"] = None; break
+            elif key in [curses.KEY_UP, ord('k')]: selection = (selection - 1) % len(entries)
+            elif key in [curses.KEY_DOWN, ord('j')]: selection = (selection + 1) % len(entries)
+            elif char == 'h' and current_path != "/":
                 current_path = os.path.dirname(current_path); selection = 0; needs_refresh = True
-        elif char == '4':
-            show_hidden = not show_hidden; needs_refresh = True
+            elif char == 'l':
+                target = os.path.join(current_path, entries[selection])
+                if os.path.isdir(target):
+                    current_path = target; selection = 0; needs_refresh = True
+                elif entries[selection] == "..":
+                    current_path = os.path.dirname(current_path); selection = 0; needs_refresh = True
+            elif key in [10, 13]: # ENTER
+                target = os.path.join(current_path, entries[selection])
+                if os.path.isdir(target) and entries[selection] != "..":
+                    opts = ["[s] Scan for Duplicates", "[c] Cancel"]
+                    if marked: opts[1:1] = [f"[r] Scan {len(marked)} Marked Roots", "[u] Unmark All Roots"]
+                    choice = draw_multi_popup(stdscr, "Image Folder Action:", opts)
+                    if choice == 's':
+                        results = find_duplicates(stdscr, target)
+                        review_duplicates(stdscr, results, target)
+                        needs_refresh = True
+                    elif choice == 'r':
+                        review_duplicates(stdscr, find_duplicates(stdscr, marked), marked)
+                        needs_refresh = True
+                    elif choice == 'u': marked.clear()
+                elif entries[selection] == "..":
+                    current_path = os.path.dirname(current_path); selection = 0; needs_refresh = True
+            elif char == 'm' and entries[selection] != "..":
+                target = os.path.join(current_path, entries[selection])
+                if os.path.isdir(target):
+                    if target in marked: marked.remove(target)
+                    else: marked.append(target)
+            elif char == '4':
+                show_hidden = not show_hidden; needs_refresh = True
+    finally:
+        if SESSION.get("review"): save_review_snapshot(SESSION["review"], SESSION["results"])
+        save_session(session_state())
+
+def stderr_progress():
+    """progress(done, total) for headless runs: one updating line on a terminal, periodic lines otherwise."""
+    interactive = sys.stderr.isatty()
+    def progress(done, total):
+        if interactive: print(f"\rHashed {done}/{total}", end="\n" if done == total else "", file=sys.stderr, flush=True)
+        elif done % 1000 == 0 or done == total: print(f"Hashed {done}/{total}", file=sys.stderr, flush=True)
+    return progress
+
+def run_headless_scan(args):
+    """`scan` subcommand: stream duplicate sets as JSON Lines on stdout, progress on stderr."""
+    progress = stderr_progress()
+    groups, roots = [], [os.path.abspath(r) for r in args.roots]
+    for hsh, size, paths in scan_duplicates(roots, progress):
+        print(json.dumps({"hash": hsh, "size": size, "paths": paths, "roots": [root_of(p, roots) for p in paths]}), flush=True)
+        if args.save_cache: groups.append((hsh, size, paths))
+    if args.save_cache: save_scan_cache(args.roots[0], group_results(groups))
+
+def run_shard(args):
+    """`shard` subcommand: write a partial index for these roots."""
+    try:
+        n = write_shard(args.roots, args.output, stderr_progress())
+        print(f"Wrote {n} images to {args.output}", file=sys.stderr)
+    except OSError as e:
+        print(f"shard: {e}", file=sys.stderr); sys.exit(1)
+
+def run_merge(args):
+    """`merge` subcommand: duplicate sets across shard files as JSON Lines, without touching any image."""
+    try:
+        shards = [load_shard(path) for path in args.shards]
+        for hsh, size, members in merge_shards(shards):
+            print(json.dumps({"hash": hsh, "size": size, "paths": [p for p, _ in members],
+                              "hosts": [shards[n]["host"] for _, n in members],
+                              "shards": [args.shards[n] for _, n in members]}), flush=True)
+    except (OSError, ValueError) as e:
+        print(f"merge: {e}", file=sys.stderr); sys.exit(1)
+
+def run_ingest(args):
+    """`ingest` subcommand: what in INCOMING is not yet in the archive described by the shards."""
+    try:
+        shards = [load_shard(path) for path in args.index]
+        counts = defaultdict(int)
+        for path, status, matches in ingest_query(args.incoming, shards, stderr_progress()):
+            counts[status] += 1
+            if args.only:
+                if status == args.only: print(path, flush=True)
+            else: print(json.dumps({"path": path, "status": status, "matches": matches}), flush=True)
+        print(f"{counts['new']} new, {counts['present']} already in archive, {counts['near']} near-duplicates", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"ingest: {e}", file=sys.stderr); sys.exit(1)
 
 if __name__ == "__main__":
-    if "-v" in sys.argv or "--version" in sys.argv:
-        print(f"dupImgBrowser {VERSION}"); sys.exit(0)
-    curses.wrapper(image_browser)
+    parser = argparse.ArgumentParser(description="Curses browser for finding and reviewing duplicate images.")
+    parser.add_argument('-v', '--version', action='version', version=f"dupImgBrowser {VERSION}")
+    add_metrics_args(parser)
+    parser.add_argument('--hash', choices=sorted(HASH_ALGOS), default="md5", help="Hash algorithm (xxh3 needs the optional xxhash package).")
+    parser.add_argument('--full', action='store_true', help="Hash whole files instead of the first 8k (exact-content verification).")
+    parser.add_argument('--read-order', choices=READ_ORDERS, default="auto", help="Hashing read order: physical extents on spinning disks, else inodes (auto); extent; inode; or plain walk order.")
+    parser.add_argument('--root', action='append', metavar='DIR', help="Open the browser by scanning these roots together (repeatable).")
+    parser.add_argument('--fresh', action='store_true', help="Start in the current folder instead of restoring the last session.")
+    sub = parser.add_subparsers(dest='command')
+    scan_p = sub.add_parser('scan', help="Scan without the UI and print duplicate sets as JSON Lines.")
+    scan_p.add_argument('roots', nargs='+', help="One or more folders to scan.")
+    scan_p.add_argument('--save-cache', action='store_true', help=f"Also store results in ROOT/{CACHE_FILE} so the browser opens them instantly (single root only).")
+    shard_p = sub.add_parser('shard', help="Hash every image under ROOT... into a self-contained partial index for `merge`.")
+    shard_p.add_argument('roots', nargs='+', help="Folders making up this shard (e.g. one disk).")
+    shard_p.add_argument('-o', '--output', required=True, metavar='FILE', help="Shard file to write.")
+    merge_p = sub.add_parser('merge', help="Combine shard files into duplicate sets (JSON Lines) without re-reading images.")
+    merge_p.add_argument('shards', nargs='+', metavar='SHARD', help="Shard files written by `shard`.")
+    ingest_p = sub.add_parser('ingest', help="Report which images in INCOMING are new, already archived or near-duplicates.")
+    ingest_p.add_argument('incoming', help="Folder to check (phone dump, camera card...).")
+    ingest_p.add_argument('--index', required=True, action='append', metavar='SHARD', help="Archive shard from `shard` (repeatable).")
+    ingest_p.add_argument('--only', choices=("new", "present", "near"), help="Print just the paths with this status, one per line.")
+    watch_p = sub.add_parser('watch', help="Stay running and keep each root's hash index and duplicate cache up to date.")
+    watch_p.add_argument('roots', nargs='+', help="One or more folders to watch.")
+    args = parser.parse_args()
+    if args.command == 'scan' and args.save_cache and len(args.roots) > 1:
+        parser.error("--save-cache needs exactly one root")
+    HASH_CONFIG.update(algo=args.hash, full=args.full, order=args.read_order)
+    if args.metrics or args.profile: METRICS.enable(args.metrics, args.profile)
+    if args.command == 'scan': run_headless_scan(args)
+    elif args.command == 'shard': run_shard(args)
+    elif args.command == 'merge': run_merge(args)
+    elif args.command == 'ingest': run_ingest(args)
+    elif args.command == 'watch': watch_duplicates(args.roots)
+    else:
+        # A closed terminal or kill still unwinds normally, so the session is saved on the way out.
+        for sig in (signal.SIGHUP, signal.SIGTERM): signal.signal(sig, lambda *_: sys.exit(0))
+        curses.wrapper(image_browser, args.root, args.fresh)
 
-# VERSION: v.0.2.12
+# VERSION: v.0.2.38
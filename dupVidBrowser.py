@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# VERSION: v.0.3.14
+# VERSION: v.0.3.34
 
 import os
 import curses
@@ -9,17 +9,136 @@ import socket
 import time
 import sys
 import argparse
-import multiprocessing
+import json
+import atexit
+import shlex
+import hashlib
+import threading
+import bisect
+import re
+import signal
+from array import array
+from collections import defaultdict, OrderedDict, Counter
+from itertools import chain
 
 # --- Metadata ---
-# Version: 0.3.14
-# Fixes: removed tmpfs logic (writes directly to dir).
-# Fixes: corrected vid_dup_finder CLI arguments (uses redirection > for output).
-# Retains: VIM navigation fixes and thread limiting.
+# Version: 0.3.34
+# Changed: Fast start - reopens the last folder, cursor, listing and review from a session file (checked in the background), no splash.
+# Added: [/] incremental review filter (name, dir:, ext:, re:, >size <size) with [D] bulk delete of the matches.
+# Added: Review shows file sizes and reclaimable space per set, sorts by savings ([s]) and counts space freed this session.
+# Retains: direct-to-dir dups.txt, redirection-based vid_dup_finder call, VIM navigation and thread limiting.
 
-VERSION = "v.0.3.14"
+VERSION = "v.0.3.34"
 VIDEO_EXTS = ('.mp4', '.mkv', '.avi', '.mov', '.flv', '.wmv', '.m4v', '.mpg', '.mpeg')
 TEXT_EXTS = ('.txt', '.py', '.sh', '.conf', '.json', '.md', '.log', '.csv', '.bash_aliases', '.yaml', '.yml')
+# Per-user dirs only: a socket in the shared tmp dir could be pre-created or hijacked by another user.
+SSH_CONTROL_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser("~/.ssh"), "dupvid-%C")
+SIZES_SUFFIX = ".sizes"  # dups.txt.sizes: every listed file's size, written by the scan
+SSH_PERSIST = "10m"  # how long the shared connection to the client outlives its last use
+SHEET_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dupVidBrowser", "sheets")
+SHEET_FRAMES = 4                 # keyframes per contact sheet, stacked top to bottom
+SHEET_FRAME_SIZE = (96, 54)      # pixels per frame
+SHEET_CACHE_MAX = 256 << 20      # on-disk sheet cache, least recently used evicted first
+PREFETCH_SETS = 2                # sets either side of the cursor to extract ahead of time
+NAME_INDEX_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dupVidBrowser", "names")
+FIND_LIMIT = 200                 # results shown by [f] Find
+FUZZY_POSTING_MAX = 100000       # trigrams on more paths than this are skipped by the fuzzy pass
+FUZZY_MIN_SHARED = 0.6           # fuzzy hit: shares this much of the query's trigrams (else letters in order)
+SESSION_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dupVidBrowser", "session.json")
+REVIEW_FILE = os.path.join(os.path.dirname(SESSION_FILE), "review.json")  # result set of a review left open
+SNAPSHOT_MAX = 20000             # bigger listings are not stored in the session file
+SAMPLE_BYTES = 64 << 10          # bytes hashed at each sample point of the exact-copy prefilter
+SAMPLE_POINTS = (0.0, 0.25, 0.5, 0.75, 1.0)  # head .. tail, as fractions of the file size
+EXCLUDE_ARG_BYTES = 512 << 10    # argv space for --exclude paths; Linux allows ~2 MB of args + environment in total
+
+# --- Metrics (--metrics / --profile) ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: ScanMetrics, _PhaseTimer, _NullTimer, add_metrics_args.
+
+class ScanMetrics:
+    """Per-phase wall time, call counts and bytes. A no-op until enable() is called."""
+    def __init__(self, tool, version):
+        self.tool, self.version, self.enabled = tool, version, False
+        self.phases, self.counters = {}, defaultdict(int)
+        self.started, self.profiler = time.perf_counter(), None
+
+    def enable(self, metrics_path=None, profile_path=None):
+        self.enabled, self.started = True, time.perf_counter()
+        if profile_path:
+            import cProfile
+            self.profiler = cProfile.Profile(); self.profiler.enable()
+        atexit.register(self.finish, metrics_path, profile_path)
+
+    def phase(self, name):
+        return _PhaseTimer(self, name) if self.enabled else _NULL_TIMER
+
+    def add(self, phase, seconds=0.0, calls=0, nbytes=0):
+        if not self.enabled: return  # the review records its draws whether or not metrics are on
+        rec = self.phases.setdefault(phase, [0.0, 0, 0])
+        rec[0] += seconds; rec[1] += calls; rec[2] += nbytes
+
+    def count(self, name, n=1):
+        if self.enabled: self.counters[name] += n
+
+    def summary(self):
+        phases = {}
+        for name, (secs, calls, nbytes) in self.phases.items():
+            phases[name] = {"seconds": round(secs, 6), "calls": calls, "bytes": nbytes,
+                            "bytes_per_sec": round(nbytes / secs, 1) if secs > 0 else 0.0}
+        return {"tool": self.tool, "version": self.version, "timestamp": round(time.time(), 3),
+                "wall_seconds": round(time.perf_counter() - self.started, 6),
+                "phases": phases, "counters": dict(self.counters)}
+
+    def prometheus(self, data):
+        tool = f'tool="{self.tool}"'
+        out = ["# TYPE scan_wall_seconds gauge", f"scan_wall_seconds{{{tool}}} {data['wall_seconds']}",
+               "# TYPE scan_last_run_timestamp_seconds gauge", f"scan_last_run_timestamp_seconds{{{tool}}} {data['timestamp']}"]
+        for metric, key in (("scan_phase_seconds", "seconds"), ("scan_phase_calls", "calls"),
+                            ("scan_phase_bytes", "bytes"), ("scan_phase_bytes_per_second", "bytes_per_sec")):
+            out.append(f"# TYPE {metric} gauge")
+            for name, p in data["phases"].items(): out.append(f'{metric}{{{tool},phase="{name}"}} {p[key]}')
+        out.append("# TYPE scan_counter gauge")
+        for name, n in data["counters"].items(): out.append(f'scan_counter{{{tool},name="{name}"}} {n}')
+        return "\n".join(out) + "\n"
+
+    def finish(self, metrics_path=None, profile_path=None):
+        if self.profiler:
+            self.profiler.disable(); self.profiler.dump_stats(profile_path)
+        data = self.summary()
+        print(f"[metrics] {self.tool} wall {data['wall_seconds']:.3f}s", file=sys.stderr)
+        for name, p in sorted(data["phases"].items(), key=lambda kv: -kv[1]["seconds"]):
+            rate = f" {p['bytes_per_sec'] / 1048576:.1f} MiB/s" if p["bytes"] else ""
+            print(f"[metrics]   {name:<12} {p['seconds']:9.3f}s  x{p['calls']}{rate}", file=sys.stderr)
+        if not metrics_path: return
+        try:
+            tmp = metrics_path + ".tmp"  # atomic swap so node_exporter never reads a partial file
+            with open(tmp, 'w', encoding='utf-8') as f:
+                if metrics_path.endswith(".prom"): f.write(self.prometheus(data))
+                else: json.dump(data, f, indent=2)
+            os.replace(tmp, metrics_path)
+        except OSError as e: print(f"[metrics] Could not write '{metrics_path}': {e}", file=sys.stderr)
+
+class _PhaseTimer:
+    __slots__ = ("metrics", "name", "nbytes", "t0")
+    def __init__(self, metrics, name):
+        self.metrics, self.name, self.nbytes = metrics, name, 0
+    def __enter__(self):
+        self.t0 = time.perf_counter(); return self
+    def __exit__(self, *exc):
+        self.metrics.add(self.name, time.perf_counter() - self.t0, 1, self.nbytes)
+
+class _NullTimer:
+    __slots__ = ("nbytes",)
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+_NULL_TIMER = _NullTimer(); _NULL_TIMER.nbytes = 0
+
+def add_metrics_args(parser):
+    parser.add_argument('--metrics', metavar='FILE', help="Write a per-phase timing summary at exit (JSON, or Prometheus textfile if FILE ends in .prom).")
+    parser.add_argument('--profile', metavar='FILE', help="Also dump cProfile stats to FILE (view with: python3 -m pstats FILE).")
+
+METRICS = ScanMetrics("dupVidBrowser", VERSION)
 
 def get_optimal_threads():
     """Returns a safe number of threads for your 3420 Desktop or Laptop."""
@@ -39,24 +158,730 @@ def get_connection_info():
         return f"[ REMOTE{session_label}: {user}@{hostname} ]", parts[0], parts[2], user
     return f"[ LOCAL{session_label} ]", None, "localhost", user
 
+# --- Remote Playback (one multiplexed SSH connection per session) ---
+
+def ssh_mux_args():
+    """ssh options that route every call to the client through one ControlMaster socket."""
+    try: os.makedirs(os.path.dirname(SSH_CONTROL_PATH), mode=0o700, exist_ok=True)
+    except OSError: pass
+    return ['-o', 'ControlMaster=auto', '-o', f'ControlPath={SSH_CONTROL_PATH}', '-o', f'ControlPersist={SSH_PERSIST}']
+
+def warm_ssh_master(client_ip):
+    """Open the shared connection in the background so the first [v] Play skips the handshake."""
+    check = subprocess.run(['ssh', *ssh_mux_args(), '-O', 'check', client_ip], capture_output=True)
+    if check.returncode == 0: return
+    # BatchMode: never prompt under curses; if keys aren't set up, the first Play connects as before.
+    subprocess.Popen(['ssh', *ssh_mux_args(), '-o', 'BatchMode=yes', '-f', '-N', client_ip],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def play_video(path, client_ip, server_ip, user):
+    """Play locally in VLC, or ask VLC on the SSH client to stream it back over sftp://."""
+    with METRICS.phase("play"):
+        if client_ip:
+            sftp_url = f"sftp://{user}@{server_ip}{os.path.abspath(path)}"
+            subprocess.run(['ssh', *ssh_mux_args(), '-f', client_ip, f"export DISPLAY=:0; vlc {shlex.quote(sftp_url)} > /dev/null 2>&1 &"])
+        else: subprocess.run(['vlc', path], stderr=subprocess.DEVNULL)
+
+# --- Contact Sheets ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: read_ppm, preview_cell_style, draw_thumbnail.
+
+def read_ppm(path):
+    """Load a binary PPM (P6) image as (width, height, rgb_bytes)."""
+    with open(path, 'rb') as f: data = f.read()
+    parts = data.split(maxsplit=4)  # magic, width, height, maxval, pixels
+    if parts[0] != b"P6": raise ValueError(f"not a PPM: {path}")
+    w, h = int(parts[1]), int(parts[2])
+    return w, h, data[len(data) - w * h * 3:]
+
+def probe_duration(path):
+    result = subprocess.run(["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", path],
+                            capture_output=True, text=True)
+    return float(result.stdout.strip())
+
+def make_contact_sheet(path):
+    """
+    Contact sheet for a video, from the disk cache (keyed by path/size/mtime) or
+    built with one ffmpeg call that seeks to SHEET_FRAMES evenly spaced keyframes.
+    """
+    st = os.stat(path)
+    key = hashlib.sha1(f"{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}".encode()).hexdigest()
+    sheet_path = os.path.join(SHEET_DIR, key + ".ppm")
+    if os.path.exists(sheet_path):
+        os.utime(sheet_path)  # mtime doubles as LRU recency
+        return read_ppm(sheet_path)
+    with METRICS.phase("sheet"):
+        duration = probe_duration(path)
+        fw, fh = SHEET_FRAME_SIZE
+        cmd, chains = ["ffmpeg", "-v", "error", "-nostdin"], []
+        for n in range(SHEET_FRAMES):
+            # -noaccurate_seek: take the keyframe at/before the offset instead of decoding up to it
+            cmd += ["-noaccurate_seek", "-ss", f"{duration * (n + 0.5) / SHEET_FRAMES:.2f}", "-i", path]
+            chains.append(f"[{n}:v:0]scale={fw}:{fh}:force_original_aspect_ratio=decrease,pad={fw}:{fh}:(ow-iw)/2:(oh-ih)/2,setsar=1[f{n}]")
+        stack = "".join(f"[f{n}]" for n in range(SHEET_FRAMES)) + f"vstack=inputs={SHEET_FRAMES}[out]"
+        tmp = f"{sheet_path}.{threading.get_ident()}.tmp.ppm"
+        cmd += ["-filter_complex", ";".join(chains + [stack]), "-map", "[out]", "-frames:v", "1", "-y", tmp]
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        os.replace(tmp, sheet_path)
+    return read_ppm(sheet_path)
+
+class ContactSheetCache:
+    """Builds contact sheets on a background pool; finished ones are kept in a small in-memory LRU."""
+    def __init__(self, workers=None, keep=128):
+        os.makedirs(SHEET_DIR, exist_ok=True)
+        from concurrent.futures import ThreadPoolExecutor  # deferred: only [p] needs it, and it is slow to import
+        self.pool = ThreadPoolExecutor(workers or int(get_optimal_threads()))
+        self.pending, self.ready, self.keep = {}, OrderedDict(), keep
+        self.lock, self.writes = threading.Lock(), 0
+
+    def _work(self, path):
+        sheet = make_contact_sheet(path)
+        with self.lock:
+            self.writes += 1
+            if self.writes % 50 == 0: self.evict()
+        return sheet
+
+    def request(self, path):
+        if path not in self.ready and path not in self.pending:
+            self.pending[path] = self.pool.submit(self._work, path)
+
+    def get(self, path):
+        """The (w, h, rgb) sheet, None while pending, or False if it could not be made."""
+        fut = self.pending.get(path)
+        if fut is not None and fut.done():
+            del self.pending[path]
+            try: self.ready[path] = fut.result()
+            except Exception: self.ready[path] = False
+            while len(self.ready) > self.keep: self.ready.popitem(last=False)
+        if path in self.ready:
+            self.ready.move_to_end(path); return self.ready[path]
+        return None
+
+    def busy(self):
+        return any(not f.done() for f in self.pending.values())
+
+    def evict(self):
+        """Trim the disk cache to SHEET_CACHE_MAX, oldest-used first."""
+        try:
+            files = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(SHEET_DIR) if e.name.endswith(".ppm")]
+        except OSError: return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= SHEET_CACHE_MAX: break
+            try: os.remove(path); total -= size
+            except OSError: pass
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+_preview_pairs = {}
+
+def preview_cell_style(r, g, b):
+    """Curses attr for one pixel: a 6x6x6-cube background colour, or None if the terminal lacks 256 colours."""
+    if curses.COLORS < 256 or curses.COLOR_PAIRS < 16 + 216: return None
+    cube = 16 + 36 * (r * 6 // 256) + 6 * (g * 6 // 256) + (b * 6 // 256)
+    pair = _preview_pairs.get(cube)
+    if pair is None:
+        pair = _preview_pairs[cube] = 16 + len(_preview_pairs)
+        curses.init_pair(pair, curses.COLOR_WHITE, cube)
+    return curses.color_pair(pair)
+
+def draw_thumbnail(stdscr, thumb, y, x, rows, cols):
+    """Render an image into a rows x cols cell box; falls back to an ASCII shade ramp without 256 colours."""
+    if not thumb:
+        stdscr.addstr(y, x, ("loading..." if thumb is None else "no preview")[:cols], curses.color_pair(1)); return
+    tw, th, rgb = thumb
+    scale = max(tw / cols, th / (rows * 2))  # a cell is about twice as tall as it is wide
+    out_w, out_h = max(1, int(tw / scale)), max(1, int(th / scale / 2))
+    ramp = " .:-=+*#%@"
+    for row in range(min(out_h, rows)):
+        py = min(th - 1, int(row * 2 * scale))
+        for col in range(min(out_w, cols)):
+            i = (py * tw + min(tw - 1, int(col * scale))) * 3
+            r, g, b = rgb[i], rgb[i + 1], rgb[i + 2]
+            style = preview_cell_style(r, g, b)
+            try:
+                if style is not None: stdscr.addstr(y + row, x + col, " ", style)
+                else: stdscr.addstr(y + row, x + col, ramp[(r * 30 + g * 59 + b * 11) * (len(ramp) - 1) // 25500])
+            except curses.error: pass
+
+# --- Compact Result Sets ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: DupResults.
+
+class DupResults:
+    """
+    Duplicate sets stored compactly for huge result sets: each folder path is
+    interned once, file names and set headers are packed into UTF-8 blobs, and
+    every boundary lives in a typed array, so a file costs a few dozen bytes
+    instead of a Python string per line. Indexing by row yields the same lines
+    as the old flat list (optional "--- ... ---" header, one row per path,
+    blank separator). File sizes are kept alongside (-1 until first needed,
+    then stat'ed once) for reclaimable-space accounting.
+    """
+    __slots__ = ("dirs", "dir_ids", "file_dirs", "name_blob", "name_ends", "label_blob", "label_ends",
+                 "offsets", "row_starts", "deleted", "sizes", "origin", "order", "rank")
+
+    def __init__(self):
+        self.dirs, self.dir_ids, self.file_dirs = [], {}, array('I')
+        self.name_blob, self.name_ends, self.deleted = bytearray(), array('Q', [0]), bytearray()
+        self.label_blob, self.label_ends = bytearray(), array('Q', [0])
+        self.offsets, self.row_starts = array('Q', [0]), array('Q', [0])
+        self.sizes, self.origin = array('q'), array('I')  # origin: each set's position in scan order
+        self.order, self.rank = array('I'), array('I')  # display order of the sets, and each set's place in it
+
+    def add_group(self, label, paths, sizes=None):
+        """Append a set; label is its header line (or None for no header), sizes its file sizes if known."""
+        if not paths: return
+        for p in paths:
+            cut = p.rfind('/') + 1
+            d = p[:cut]
+            did = self.dir_ids.get(d)
+            if did is None: did = self.dir_ids[d] = len(self.dirs); self.dirs.append(d)
+            self.file_dirs.append(did); self.deleted.append(0)
+            self.name_blob += p[cut:].encode('utf-8', 'surrogateescape'); self.name_ends.append(len(self.name_blob))
+        self.sizes.extend(sizes if sizes is not None else [-1] * len(paths))
+        if label: self.label_blob += label.encode('utf-8', 'surrogateescape')
+        self.rank.append(len(self.order)); self.order.append(len(self.origin)); self.origin.append(len(self.origin))
+        self.label_ends.append(len(self.label_blob)); self.offsets.append(self.offsets[-1] + len(paths))
+        self.row_starts.append(self.row_starts[-1] + bool(label) + len(paths) + 1)
+
+    @classmethod
+    def from_lines(cls, lines, default_label=None):
+        """Parse the flat text format (dups.txt or an old cache) without holding every line."""
+        results, label, paths = cls(), None, []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                results.add_group(label or default_label, paths, cls.header_sizes(label, paths)); label, paths = None, []
+            elif line.startswith("--- DELETED"): continue
+            elif line.startswith("---"):
+                if paths: results.add_group(label or default_label, paths, cls.header_sizes(label, paths)); paths = []
+                label = line
+            else: paths.append(line)
+        results.add_group(label or default_label, paths, cls.header_sizes(label, paths))
+        return results
+
+    @staticmethod
+    def header_sizes(label, paths):
+        """File sizes from an '--- EXACT COPIES: ... (N bytes each) ---' header, or None if it has none."""
+        each = re.search(r"\((\d+) bytes each\)", label or "")
+        return [int(each.group(1))] * len(paths) if each else None
+
+    def to_json(self):
+        return {"dirs": self.dirs, "file_dirs": self.file_dirs.tolist(), "offsets": self.offsets.tolist(),
+                "names": [self.name(i) for i in range(self.count())], "sizes": self.sizes.tolist(),
+                "labels": [self.label(g) for g in range(self.group_count())], "origin": self.origin.tolist(),
+                "deleted": [i for i, d in enumerate(self.deleted) if d]}
+
+    @classmethod
+    def from_json(cls, data):
+        results, dirs, names, offsets = cls(), data["dirs"], data["names"], data["offsets"]
+        sizes = data.get("sizes") or [-1] * len(names)
+        for g, label in enumerate(data["labels"]):
+            a, b = offsets[g], offsets[g + 1]
+            results.add_group(label, [dirs[data["file_dirs"][i]] + names[i] for i in range(a, b)], sizes[a:b])
+        for i in data.get("deleted", []): results.deleted[i] = 1
+        if "origin" in data: results.origin = array('I', data["origin"])
+        return results
+
+    def set_order(self, groups):
+        """Show the sets in the given order; only the per-set row table is rebuilt, files keep their numbers."""
+        self.order, self.rank, self.row_starts = array('I', groups), array('I', bytes(4 * len(groups))), array('Q', [0])
+        for n, g in enumerate(self.order):
+            self.rank[g] = n
+            self.row_starts.append(self.row_starts[-1] + (self.label_ends[g + 1] > self.label_ends[g]) + self.offsets[g + 1] - self.offsets[g] + 1)
+
+    def __len__(self):
+        """Number of display rows."""
+        return self.row_starts[-1]
+
+    def count(self):
+        """Number of files across all sets."""
+        return len(self.deleted)
+
+    def group_count(self):
+        return len(self.offsets) - 1
+
+    def name(self, i):
+        return self.name_blob[self.name_ends[i]:self.name_ends[i + 1]].decode('utf-8', 'surrogateescape')
+
+    def path(self, i):
+        return self.dirs[self.file_dirs[i]] + self.name(i)
+
+    def label(self, g):
+        """Header line of set g, or None."""
+        a, b = self.label_ends[g], self.label_ends[g + 1]
+        return self.label_blob[a:b].decode('utf-8', 'surrogateescape') if b > a else None
+
+    def size(self, i):
+        """Size of file i, stat'ed on first use and then cached (0 if it cannot be read)."""
+        if self.sizes[i] < 0:
+            try: self.sizes[i] = os.path.getsize(self.path(i))
+            except OSError: self.sizes[i] = 0
+        return self.sizes[i]
+
+    def reclaimable(self, g):
+        """Bytes freed by keeping only the largest remaining file of set g."""
+        live = [self.size(i) for i in self.members(g) if not self.deleted[i]]
+        return sum(live) - max(live) if live else 0
+
+    def by_savings(self):
+        """Set numbers, most reclaimable space first (scan order breaks ties)."""
+        return sorted(range(self.group_count()), key=lambda g: (-self.reclaimable(g), self.origin[g]))
+
+    def group_of(self, i):
+        return bisect.bisect_right(self.offsets, i) - 1
+
+    def members(self, g):
+        return range(self.offsets[g], self.offsets[g + 1])
+
+    def first(self):
+        """First file in display order."""
+        return self.offsets[self.order[0]] if self.order else 0
+
+    def step(self, i, d):
+        """The file d (+1 or -1) places after file i in display order, wrapping around."""
+        g = self.group_of(i)
+        if self.offsets[g] <= i + d < self.offsets[g + 1]: return i + d
+        g = self.order[(self.rank[g] + d) % len(self.order)]
+        return self.offsets[g] if d > 0 else self.offsets[g + 1] - 1
+
+    def member_row(self, i):
+        g = self.group_of(i)
+        return self.row_starts[self.rank[g]] + (self.label_ends[g + 1] > self.label_ends[g]) + i - self.offsets[g]
+
+    def locate(self, row):
+        """(set, file) for a display row; file is None on a header and -1 on the blank separator."""
+        n = bisect.bisect_right(self.row_starts, row) - 1; g = self.order[n]
+        k = row - self.row_starts[n] - (self.label_ends[g + 1] > self.label_ends[g])
+        if k < 0: return g, None
+        i = self.offsets[g] + k
+        return g, (i if i < self.offsets[g + 1] else -1)
+
+    def __getitem__(self, row):
+        g, i = self.locate(row)
+        if i is None: return self.label(g)
+        if i < 0: return ""
+        return f"--- DELETED: {self.path(i)} ---" if self.deleted[i] else self.path(i)
+
+# --- Review Filter ([/] in review) ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: SIZE_UNITS, parse_size, GroupFilter.
+
+SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+def parse_size(text):
+    """'10M' -> 10485760; None if text is not a size (yet)."""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    try: return int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+    except ValueError: return None
+
+class GroupFilter:
+    """
+    Incremental filter over a DupResults. A query is space separated terms that
+    must all hold for one file of a set:
+        word      in the folder or file name       dir:x   in the folder
+        ext:jp    extension starts with            re:pat  regex on the full path
+        >10M <2G  size range (K/M/G/T)
+    Matching sets are copied into `view` (a DupResults, so the review draws it
+    unchanged) in order and lazily: a keystroke only evaluates enough sets to
+    fill the screen and advance() finishes the rest in idle chunks. Lowercased
+    names, extensions and folders are computed once, and a query that only
+    narrows the previous one re-checks just the sets that matched before.
+    """
+    CHUNK = 5000
+
+    def __init__(self, results):
+        self.results = results
+        self.names = [results.name(i).lower() for i in range(results.count())]
+        self.exts = [sys.intern(os.path.splitext(n)[1][1:]) for n in self.names]
+        self.dirs = [d.lower() for d in results.dirs]
+        self.query, self.done, self.src = "", True, array('I', results.order)
+        self.view, self.hits = results, []
+
+    def compile(self, query):
+        r, names, exts, dirs, fdirs = self.results, self.names, self.exts, self.dirs, self.results.file_dirs
+        tests = []
+        for raw in query.split():
+            term = raw.lower()  # regexes keep their case: lowercasing turns \D \S \W \B into \d \s \w \b
+            if term.startswith("re:"):
+                pattern = re.compile(raw[3:], re.I)
+                tests.append(lambda i, p=pattern: p.search(r.path(i)))
+            elif term.startswith("dir:"): tests.append(lambda i, t=term[4:]: t in dirs[fdirs[i]])
+            elif term.startswith("ext:"): tests.append(lambda i, t=term[4:].lstrip('.'): exts[i].startswith(t))
+            elif term[0] in "<>":
+                limit = parse_size(term[1:])
+                if limit is None: continue  # still being typed
+                tests.append((lambda i, n=limit: r.size(i) > n) if term[0] == ">" else (lambda i, n=limit: r.size(i) < n))
+            else: tests.append(lambda i, t=term: t in names[i] or t in dirs[fdirs[i]])
+        return tests
+
+    @staticmethod
+    def kind(term):
+        for prefix in ("re:", "dir:", "ext:", "<", ">"):
+            if term.lower().startswith(prefix): return prefix
+        return "word"
+
+    def narrows(self, query):
+        """True if every set matching query also matched the (fully evaluated) previous one."""
+        if not self.done or not self.query.strip() or not query.startswith(self.query): return False
+        if query == self.query or self.query.endswith(" ") or query[len(self.query)] == " ": return True  # same, or one more term
+        old_last, new_last = self.query.split()[-1], query.split()[len(self.query.split()) - 1]
+        # Typing on into a substring/prefix can only shrink it; '<' and regexes can grow. A '>' bound
+        # narrows only if it rose: '>9e' does not parse (no test at all) and '>9e-3' is lower than '>9'.
+        if self.kind(old_last) != self.kind(new_last) or self.kind(old_last) in ("re:", "<"): return False
+        if self.kind(old_last) != ">": return True
+        old_n, new_n = parse_size(old_last[1:]), parse_size(new_last[1:])
+        return old_n is None or (new_n is not None and new_n >= old_n)
+
+    def set_query(self, query):
+        """Start evaluating query (raises re.error for a bad regex); call advance() to fill the view."""
+        tests = self.compile(query)
+        candidates = self.src if self.narrows(query) else array('I', self.results.order)
+        self.query, self.tests, self.candidates, self.pos, self.done = query, tests, candidates, 0, False
+        self.view, self.src, self.hits = DupResults(), array('I'), []
+
+    def advance(self, budget=CHUNK):
+        """Evaluate up to budget more sets; returns True once the whole query is done."""
+        r, tests, end = self.results, self.tests, min(len(self.candidates), self.pos + budget)
+        for g in self.candidates[self.pos:end]:
+            hits = [i for i in r.members(g) if not r.deleted[i] and all(t(i) for t in tests)]
+            if not hits: continue
+            a, b = r.offsets[g], r.offsets[g + 1]
+            self.view.add_group(r.label(g), [r.path(i) for i in range(a, b)], r.sizes[a:b])
+            self.view.deleted[a - b:] = r.deleted[a:b]
+            self.src.append(g); self.hits.append([self.view.count() - (b - i) for i in hits])
+        self.pos = end; self.done = end >= len(self.candidates)
+        return self.done
+
+    def base_file(self, i):
+        """The results file behind view file i."""
+        g = self.view.group_of(i)
+        return self.results.offsets[self.src[g]] + i - self.view.offsets[g]
+
+    def bulk_targets(self):
+        """View files matching the query, minus one copy (the largest) of any set it would empty."""
+        while not self.advance(): pass
+        targets, kept = [], 0
+        for g, hits in enumerate(self.hits):
+            hits = [i for i in hits if not self.view.deleted[i]]
+            live = [i for i in self.view.members(g) if not self.view.deleted[i]]
+            if hits and len(hits) == len(live):
+                hits.remove(max(hits, key=self.view.size)); kept += 1
+            targets.extend(hits)
+        return targets, kept
+
+# --- Filename Index ([f] Find) ---
+
+class FilenameIndex:
+    """
+    Persisted listing of every (non-hidden) file and folder under root, with a
+    trigram index over the lower-cased relative paths. Refreshes run on a
+    background thread and only re-list directories whose mtime has changed.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.path = os.path.join(NAME_INDEX_DIR, hashlib.sha1(root.encode()).hexdigest() + ".json")
+        self.dirs, self.entries, self.grams = {}, [], {}
+        self.lock, self.generation, self.building = threading.Lock(), 0, False
+        self.start_refresh(load=True)
+
+    def start_refresh(self, load=False):
+        if self.building: return
+        self.building = True
+        threading.Thread(target=self._refresh, args=(load,), daemon=True).start()
+
+    def _refresh(self, load):
+        try:
+            if load:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f: self.dirs = json.load(f).get("dirs", {})
+                    self._reindex()  # searchable straight away from the saved listing
+                except (OSError, ValueError): pass
+            if self.rescan() or not self.generation:
+                self._reindex(); self.save()
+        finally: self.building = False
+
+    def rescan(self):
+        """Walk root, reusing stored listings of unchanged directories. Returns True if anything changed."""
+        new, stack, changed = {}, [""], False
+        with METRICS.phase("name_walk"):
+            while stack:
+                rel = stack.pop()
+                full = os.path.join(self.root, rel)
+                try: mtime = os.stat(full).st_mtime_ns
+                except OSError: continue
+                rec = self.dirs.get(rel)
+                if not rec or rec[0] != mtime:
+                    files, subdirs = [], []
+                    try:
+                        with os.scandir(full) as it:
+                            for e in it:
+                                if e.name.startswith('.'): continue
+                                (subdirs if e.is_dir(follow_symlinks=False) else files).append(e.name)
+                    except OSError: pass
+                    rec, changed = [mtime, sorted(files, key=str.lower), sorted(subdirs, key=str.lower)], True
+                new[rel] = rec
+                stack.extend(os.path.join(rel, d) for d in rec[2])
+        changed = changed or len(new) != len(self.dirs)
+        self.dirs = new
+        return changed
+
+    def _reindex(self):
+        entries, grams = [], defaultdict(list)
+        for rel, (_, files, subdirs) in self.dirs.items():
+            prefix = rel + "/" if rel else ""
+            entries.extend(prefix + d + "/" for d in subdirs)
+            entries.extend(prefix + f for f in files)
+        for i, entry in enumerate(entries):
+            low = entry.lower()
+            for gram in {low[j:j + 3] for j in range(len(low) - 2)}: grams[gram].append(i)
+        with self.lock: self.entries, self.grams, self.generation = entries, grams, self.generation + 1
+
+    def save(self):
+        try:
+            os.makedirs(NAME_INDEX_DIR, exist_ok=True); tmp = self.path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump({"root": self.root, "dirs": self.dirs}, f)
+            os.replace(tmp, self.path)
+        except OSError: pass
+
+    def search(self, query, limit=FIND_LIMIT):
+        """
+        Relative paths containing every word of query (case-insensitive), name matches and
+        short paths first. Short of limit, a fuzzy pass adds paths sharing most of the query's
+        trigrams (a typo) or holding each word's letters in order ("vcation" -> vacation).
+        """
+        words = query.lower().split()
+        if not words: return []
+        with self.lock: entries, grams = self.entries, self.grams
+        postings = sorted((grams.get(w[j:j + 3], []) for w in words for j in range(len(w) - 2)), key=len)
+        if postings:
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates: break
+                candidates.intersection_update(posting)
+            candidates = sorted(candidates)
+        else: candidates = range(len(entries))  # only 1-2 letter words: plain scan
+        hits = []
+        for i in candidates:
+            low = entries[i].lower()
+            if all(w in low for w in words):
+                hits.append(entries[i])
+                if len(hits) >= limit * 5: break
+        last = words[-1]
+        hits.sort(key=lambda e: (last not in os.path.basename(e.rstrip('/')).lower(), len(e)))
+        if len(hits) >= limit or not postings: return hits[:limit]
+        # Fuzzy pass: paths sharing at least a third of the query's trigrams, most shared first.
+        # Very common trigrams (".mp4") say little and would make the count slow, so they are left out.
+        shared = Counter(chain.from_iterable(p for p in postings if len(p) <= FUZZY_POSTING_MAX))
+        need, found = -(-len(postings) // 3), set(hits)
+        for i in sorted((i for i, n in shared.items() if n >= need), key=shared.__getitem__, reverse=True):
+            if entries[i] in found: continue
+            low = entries[i].lower()
+            if shared[i] >= FUZZY_MIN_SHARED * len(postings) or all(all(c in it for c in w) for w in words for it in [iter(low)]):
+                hits.append(entries[i])
+                if len(hits) >= limit: break
+        return hits
+
+def draw_find(stdscr, index):
+    """Type-ahead search over a FilenameIndex. Returns the chosen absolute path ('/'-suffixed for folders) or None."""
+    query, sel, results, seen, elapsed = "", 0, [], None, 0.0
+    curses.curs_set(1); stdscr.timeout(100)  # poll so results appear as the background index lands
+    try:
+        while True:
+            if (query, index.generation) != seen:
+                # Only the index grew (same query): stay on the entry the cursor was on.
+                keep = results[sel] if results and seen and seen[0] == query else None
+                t0 = time.perf_counter()
+                with METRICS.phase("find"): results = index.search(query)
+                elapsed, seen = (time.perf_counter() - t0) * 1000, (query, index.generation)
+                sel = results.index(keep) if keep in results else 0
+            stdscr.erase(); h, w = stdscr.getmaxyx()
+            if sel >= h-2: sel = 0
+            status = f" {len(results)} matches in {elapsed:.1f} ms | {len(index.entries)} names indexed"
+            if index.building: status += " | indexing..."
+            stdscr.addstr(h-1, 0, f"{status} | [Up/Down] Select [Enter] Go [Esc] Cancel ".ljust(w-1)[:w-1], curses.color_pair(2))
+            for i, rel in enumerate(results[:h-2]):
+                style = curses.color_pair(2) if i == sel else curses.color_pair(1)
+                stdscr.addstr(i + 1, 0, f"{'> ' if i == sel else '  '}{rel}"[:w-1].ljust(w-1)[:w-1], style)
+            prompt = f" Find in {index.root}: "
+            stdscr.addstr(0, 0, f"{prompt}{query}".ljust(w-1)[:w-1], curses.color_pair(2))
+            stdscr.move(0, min(w-2, len(prompt) + len(query)))
+            stdscr.refresh()
+
+            ch = stdscr.getch()
+            if ch == -1: continue
+            elif ch == 27: return None
+            elif ch in [10, 13]: return os.path.join(index.root, results[sel]) if results else None
+            elif ch == curses.KEY_UP and results: sel = (sel - 1) % min(len(results), h-2)
+            elif ch == curses.KEY_DOWN and results: sel = (sel + 1) % min(len(results), h-2)
+            elif ch in [curses.KEY_BACKSPACE, 127, 8]: query = query[:-1]
+            elif 32 <= ch < 127: query += chr(ch)
+    finally:
+        stdscr.timeout(-1); curses.curs_set(0)
+
+# --- Exact-Copy Prefilter (before vid_dup_finder) ---
+
+def sample_hash(path, size):
+    """blake2b of the size plus SAMPLE_BYTES at each SAMPLE_POINTS offset: a handful of reads per file."""
+    hasher = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with METRICS.phase("sample_hash") as t, open(path, 'rb', buffering=0) as f:
+        if size <= SAMPLE_BYTES * len(SAMPLE_POINTS): spans = [(0, size)]  # small file: just read it all
+        else: spans = [(min(int(size * frac), size - SAMPLE_BYTES), SAMPLE_BYTES) for frac in SAMPLE_POINTS]
+        for offset, length in spans:
+            f.seek(offset); data = f.read(length)
+            hasher.update(data); t.nbytes += len(data)
+    return hasher.hexdigest()
+
+def exact_video_sets(directory):
+    """
+    ([(hash, size, paths)], {path: size}): videos under directory that are byte-identical copies, judged
+    by equal size and equal sample_hash, and the size of every video walked. Only files sharing a size are opened at all.
+    """
+    by_size = defaultdict(list)
+    with METRICS.phase("walk"):
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if not name.lower().endswith(VIDEO_EXTS): continue
+                path = os.path.join(root, name)
+                try: by_size[os.path.getsize(path)].append(path)
+                except OSError: continue
+    sets = []
+    for size, paths in by_size.items():
+        if len(paths) < 2 or size == 0: continue
+        hashes = defaultdict(list)
+        for path in sorted(paths):
+            try: hashes[sample_hash(path, size)].append(path)
+            except OSError: continue
+        sets.extend((hsh, size, group) for hsh, group in hashes.items() if len(group) > 1)
+    METRICS.count("exact_copies", sum(len(g) - 1 for _, _, g in sets))
+    return sets, {path: size for size, paths in by_size.items() for path in paths}
+
+def write_exact_sets(dup_file, sets):
+    """Start dups.txt with the exact sets, each under an '--- EXACT COPIES ---' header."""
+    with open(dup_file, 'w', encoding='utf-8', errors='surrogateescape') as f:
+        for hsh, size, paths in sets:
+            f.write(f"--- EXACT COPIES: {hsh} ({size} bytes each) ---\n"); f.write("\n".join(paths)); f.write("\n\n")
+
+def cap_excludes(paths, budget=EXCLUDE_ARG_BYTES):
+    """As many of paths as fit in budget bytes of argv; vid_dup_finder scans the rest like any other file."""
+    kept, used = [], 0
+    for p in paths:
+        used += len(os.fsencode(p)) + 1
+        if used > budget: break
+        kept.append(p)
+    return kept
+
+# --- Session State (fast start) ---
+
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: list_dir, load_session, save_session, ListingCheck, ReviewLoad.
+
+def list_dir(path, show_hidden):
+    """(entries, dir names, mtime_ns) for path: '..', folders, then files. One scandir, no per-entry stat."""
+    with METRICS.phase("listdir"):
+        mtime_ns = os.stat(path).st_mtime_ns  # taken first, so a change during the listing still shows next time
+        with os.scandir(path) as it:
+            items = [(e.name, e.is_dir()) for e in it if show_hidden or not e.name.startswith('.')]
+    dirs = sorted((n for n, is_dir in items if is_dir), key=str.lower)
+    files = sorted((n for n, is_dir in items if not is_dir), key=str.lower)
+    return ([".."] if path != "/" else []) + dirs + files, set(dirs), mtime_ns
+
+def load_session():
+    try:
+        with open(SESSION_FILE, 'r') as f: return json.load(f)
+    except: return {}
+
+def save_session(state):
+    try:
+        os.makedirs(os.path.dirname(SESSION_FILE), exist_ok=True); tmp = SESSION_FILE + ".tmp"
+        with open(tmp, 'w') as f: json.dump(state, f)
+        os.replace(tmp, SESSION_FILE)
+    except: pass
+
+class ListingCheck:
+    """
+    Re-validates a restored listing snapshot off the UI thread, so a slow mount
+    never delays the first frame: stat the folder and, only if its mtime moved,
+    list it again. `result` then holds the fresh (entries, dirs, mtime_ns).
+    """
+    def __init__(self, path, mtime_ns, show_hidden):
+        self.result, self.done = None, False
+        threading.Thread(target=self._run, args=(path, mtime_ns, show_hidden), daemon=True).start()
+
+    def _run(self, path, mtime_ns, show_hidden):
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns: self.result = list_dir(path, show_hidden)
+        except OSError: self.result = ([".. [Error]"], set(), 0)
+        self.done = True
+
+def load_dup_file(dup_file):
+    with METRICS.phase("dups_load") as t, open(dup_file, 'r', encoding='utf-8', errors='replace') as f:
+        results = DupResults.from_lines(f, "--- SIMILAR ---")  # vid_dup_finder sets have no header of their own
+        t.nbytes = f.tell()
+    try:  # sizes the scan already knew, so the review need not stat every file; stale once dups.txt changes
+        with open(dup_file + SIZES_SUFFIX, 'r') as f: data = json.load(f)
+        if data["mtime_ns"] == os.stat(dup_file).st_mtime_ns and len(data["sizes"]) == results.count():
+            results.sizes = array('q', data["sizes"])
+    except: pass
+    return results
+
+def save_dup_sizes(dup_file, results, sizes):
+    """Fill results' unknown sizes from the scan's walk and keep them beside dup_file for the next [v]."""
+    for i in range(results.count()):
+        if results.sizes[i] < 0: results.sizes[i] = sizes.get(results.path(i), -1)
+    try:
+        with open(dup_file + SIZES_SUFFIX, 'w') as f:
+            json.dump({"mtime_ns": os.stat(dup_file).st_mtime_ns, "sizes": results.sizes.tolist()}, f)
+    except OSError: pass
+
+def load_review_snapshot(review):
+    """The saved results of review (a SESSION["review"]) if its dups.txt is unchanged since, else that file parsed afresh."""
+    dup_file = review["dup_file"]
+    try:
+        with METRICS.phase("review_load"), open(REVIEW_FILE, 'r') as f: data = json.load(f)
+        if data["dup_file"] == dup_file and data["mtime_ns"] == os.stat(dup_file).st_mtime_ns:
+            return DupResults.from_json(data["results"])
+    except: pass
+    results = load_dup_file(dup_file)
+    with METRICS.phase("sizes"): results.by_savings()  # stat every file here, not in the review's first frame
+    return results
+
+def save_review_snapshot(review, results):
+    dup_file = review["dup_file"]
+    try:
+        os.makedirs(os.path.dirname(REVIEW_FILE), exist_ok=True); tmp = REVIEW_FILE + ".tmp"
+        with METRICS.phase("review_save"), open(tmp, 'w') as f:
+            json.dump({"dup_file": dup_file, "mtime_ns": os.stat(dup_file).st_mtime_ns, "results": results.to_json()}, f)
+        os.replace(tmp, REVIEW_FILE)
+    except: pass
+
+class ReviewLoad:
+    """
+    Loads the results of the review that was open when the last session ended,
+    off the UI thread like ListingCheck. `result` is a DupResults, or None if
+    it cannot be restored (see load_review_snapshot).
+    """
+    def __init__(self, review):
+        self.review, self.result, self.done = review, None, False
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        try: self.result = load_review_snapshot(self.review)
+        except: pass
+        self.done = True
+
 # --- UI Helpers ---
 
-def draw_splash(stdscr):
-    stdscr.clear()
-    curses.start_color()
-    curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
-    h, w = stdscr.getmaxyx()
-    title, ver_text = "DUP VID BROWSER", f"Version {VERSION}"
-    box_w, box_h = max(len(title), len(ver_text)) + 8, 5
-    start_y, start_x = (h // 2) - (box_h // 2), (w // 2) - (box_w // 2)
-    stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
-    stdscr.addstr(start_y, start_x, "+" + "-" * (box_w - 2) + "+")
-    for i in range(1, 4): stdscr.addstr(start_y + i, start_x, "|" + " " * (box_w - 2) + "|")
-    stdscr.addstr(start_y + 4, start_x, "+" + "-" * (box_w - 2) + "+")
-    stdscr.addstr(start_y + 1, start_x + (box_w - len(title)) // 2, title)
-    stdscr.addstr(start_y + 3, start_x + (box_w - len(ver_text)) // 2, ver_text)
-    stdscr.refresh()
-    time.sleep(1)
+# Kept identical in dupImgBrowser.py and dupVidBrowser.py (each script is standalone); change both: human_size, draw_status, draw_popup_confirm.
+
+SESSION = {"reclaimed": 0, "deleted": 0}  # running totals for this run of the browser
+
+def human_size(n):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024 or unit == "TB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
 
 def draw_status(stdscr, message, wait=0.8):
     h, w = stdscr.getmaxyx(); win_w = min(len(message) + 14, w-4)
@@ -92,36 +917,67 @@ def draw_multi_popup(stdscr, title, options):
 
 # --- Review & Navigation Logic ---
 
-def review_duplicates(stdscr, filepath, base_dir):
-    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
-        draw_status(stdscr, "No valid duplicates file to review."); return
+def review_duplicates(stdscr, filepath, base_dir, select=None, results=None):
+    """Review a dups.txt; a restored session passes its already loaded results and the path to select."""
+    if results is None:
+        if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+            draw_status(stdscr, "No valid duplicates file to review."); return
+        results = load_dup_file(filepath)
     curses.init_pair(3, curses.COLOR_CYAN, curses.COLOR_BLACK)
     curses.init_pair(4, curses.COLOR_BLACK, curses.COLOR_CYAN)
     
-    with open(filepath, 'r', encoding='utf-8', errors='replace') as f: 
-        lines = [line.rstrip() for line in f.readlines()]
-    
-    selectable_indices = [i for i, line in enumerate(lines) if line.strip() and not line.strip().startswith("---")]
-    if not selectable_indices: 
+    if not results.count(): 
         draw_status(stdscr, "Scan file is empty or invalid.")
         return
 
-    sel_idx, start_index = 0, 0
+    # Biggest savings first; [s] flips back to file order. Each size is stat'ed once and cached.
+    with METRICS.phase("sizes"): base, by_savings = results, True; base.set_order(base.by_savings())
+    reclaimable = sum(base.reclaimable(g) for g in range(base.group_count()))
+    sel_idx, start_index = base.first(), 0  # sel_idx is a file number in the shown results; rows are derived from it
+    if select: sel_idx = next((i for i in range(base.count()) if base.path(i) == select), sel_idx)
     base_dir_abs = os.path.abspath(base_dir).rstrip('/') + '/'
+    sheets, show_sheets = None, False
+    filt, query, typing, filter_error = None, "", False, ""  # [/] filter; the shown list is filt.view while query is set
+
+    def top():
+        return (filt.view if filt is not None and query.strip() else base).first()
+
+    def apply_filter():
+        nonlocal filt, filter_error
+        if not query.strip(): filter_error = ""; return
+        if filt is None:
+            draw_status(stdscr, "Indexing names for the filter...", 0); filt = GroupFilter(base)
+        try: filt.set_query(query); filter_error = ""
+        except re.error as e: filter_error = f"bad regex: {e}"; return
+        deadline = time.perf_counter() + 0.03  # fill the first screen now, the rest while idle
+        while not filt.advance(200) and filt.view.group_count() < stdscr.getmaxyx()[0] and time.perf_counter() < deadline: pass
     
     while True:
-        stdscr.clear(); h, w = stdscr.getmaxyx()
-        current_selection = selectable_indices[sel_idx]
-        if current_selection < start_index: start_index = current_selection
-        elif current_selection >= start_index + (h-2): start_index = current_selection - (h-2) + 1
+        draw_t0 = time.perf_counter()
+        filtering = filt is not None and bool(query.strip())
+        results = filt.view if filtering else base
+        busy = filtering and not filt.done
+        # Kept in SESSION so a session that ends here (Ctrl-C, hangup) reopens on this file.
+        SESSION["review"] = {"dup_file": filepath, "target": base_dir, "file": results.path(sel_idx) if results.count() else None}
+        SESSION["results"] = base
+        stdscr.erase() if show_sheets or busy else stdscr.clear(); h, w = stdscr.getmaxyx()
+        list_h = h // 3 if show_sheets else h - 1  # contact sheets take the bottom two thirds
+        current_selection = results.member_row(sel_idx) if results.count() else -1
+        if current_selection < start_index: start_index = max(0, current_selection)
+        elif current_selection >= start_index + (list_h-1): start_index = current_selection - (list_h-1) + 1
         
-        stdscr.addstr(0, 0, f" Reviewing: {os.path.basename(filepath)} ".ljust(w-1)[:w-1], curses.color_pair(2))
-        for i in range(h-2):
+        title = (f" Reviewing: {os.path.basename(filepath)} [s] Sort: {'savings' if by_savings else 'file order'} [p] Contact Sheets [/] Filter"
+                 f" | Reclaimable {human_size(reclaimable)} | Freed this session {human_size(SESSION['reclaimed'])} ")
+        stdscr.addstr(0, 0, title.ljust(w-1)[:w-1], curses.color_pair(2))
+        for i in range(list_h-1):
             idx = i + start_index
-            if idx >= len(lines): break
-            content = lines[idx]
+            if idx >= len(results): break
+            content = results[idx]; g, f = results.locate(idx)
             is_selected = (idx == current_selection)
-            prefix = "> " if is_selected else "  "; full_line = f"{prefix}{content}"
+            prefix = "> " if is_selected else "  "
+            if f is not None and f >= 0: prefix += f"{human_size(results.size(f)):>9}  "
+            if f is None: content += f"  [{sum(not results.deleted[m] for m in results.members(g))} files, {human_size(results.reclaimable(g))} reclaimable]"
+            full_line = f"{prefix}{content}"
             if not content.strip(): stdscr.addstr(i + 1, 0, " " * (w-1), curses.color_pair(1))
             elif content.startswith(base_dir_abs):
                 split_point = len(prefix) + len(base_dir_abs)
@@ -133,145 +989,269 @@ def review_duplicates(stdscr, filepath, base_dir):
                 style = curses.color_pair(2) if is_selected else curses.color_pair(1)
                 stdscr.addstr(i + 1, 0, full_line[:w-1].ljust(w-1)[:w-1], style)
         
-        stdscr.refresh(); ch = stdscr.getch()
+        if show_sheets and results.count():
+            group = results.group_of(sel_idx)
+            at = results.rank[group]
+            for near in results.order[max(0, at - PREFETCH_SETS):at + PREFETCH_SETS + 1]:
+                for m in results.members(near):
+                    if not results.deleted[m]: sheets.request(results.path(m))
+            members = [m for m in results.members(group) if not results.deleted[m]]
+            if members:
+                cols = max(8, (w - 1) // len(members)); top = list_h + 1
+                for n, m in enumerate(members[:max(1, (w - 1) // 8)]):
+                    x = n * cols
+                    style = curses.color_pair(2) if m == sel_idx else curses.color_pair(1)
+                    stdscr.addstr(list_h, x, f" {results.name(m)} ".ljust(cols - 1)[:cols - 1], style)
+                    draw_thumbnail(stdscr, sheets.get(results.path(m)), top, x, h - top - 1, cols - 1)
+        if typing or filtering:
+            matched = f"{filt.view.group_count()}{'+' if busy else ''} sets" if filtering else ""
+            hint = "[Enter] Keep [Esc] Clear" if typing else "[/] Edit [Esc] Clear [D] Delete matches"
+            stdscr.addstr(h-1, 0, f"/{query}{'_' if typing else ''}  {filter_error or matched}  {hint}".ljust(w-1)[:w-1], curses.color_pair(2))
+        stdscr.timeout(0 if busy else 150 if show_sheets and sheets.busy() else -1)  # idle ticks finish the filter / land sheets
+
+        stdscr.refresh(); METRICS.add("draw", time.perf_counter() - draw_t0, 1); ch = stdscr.getch()
         char = chr(ch).lower() if 0 <= ch < 256 else ""
-        if ch in [ord('q'), 27]: break
-        elif ch in [curses.KEY_UP, ord('k')]: sel_idx = (sel_idx - 1) % len(selectable_indices)
-        elif ch in [curses.KEY_DOWN, ord('j')]: sel_idx = (sel_idx + 1) % len(selectable_indices)
+        if ch == -1:
+            if busy: filt.advance()
+            continue
+        elif typing and ch not in [curses.KEY_UP, curses.KEY_DOWN]:
+            if ch in [10, 13]: typing = False
+            elif ch == 27: typing, query, filter_error = False, "", ""; sel_idx, start_index = base.first(), 0
+            elif ch in [curses.KEY_BACKSPACE, 127, 8]: query = query[:-1]; apply_filter(); sel_idx, start_index = top(), 0
+            elif 32 <= ch < 127: query += chr(ch); apply_filter(); sel_idx, start_index = top(), 0
+        elif ch == 27 and filtering: query, filter_error = "", ""; sel_idx, start_index = base.first(), 0
+        elif ch in [ord('q'), 27]: break
+        elif ch == ord('/'): typing = True
+        elif char == 'p':
+            if not shutil.which("ffmpeg"): draw_status(stdscr, "Contact sheets need ffmpeg in PATH."); continue
+            show_sheets = not show_sheets
+            if show_sheets and sheets is None: sheets = ContactSheetCache()
+        elif char == 's':
+            # Only the set order changes, so the file numbers (and the selection) stay put.
+            base.set_order(sorted(range(base.group_count()), key=lambda n: base.origin[n]) if by_savings else base.by_savings())
+            by_savings = not by_savings
+            if filtering: filt.query = ""; apply_filter(); sel_idx, start_index = top(), 0  # re-run in the new order
+        elif ch == ord('D') and filtering:
+            targets, kept = filt.bulk_targets()
+            if not targets: draw_status(stdscr, "Nothing left to delete in this view."); continue
+            nbytes = sum(filt.view.size(i) for i in targets)
+            if not draw_popup_confirm(stdscr, f"Delete {len(targets)} matching files ({human_size(nbytes)})? {kept} sets keep one copy."): continue
+            errors = 0
+            for i in targets:
+                bi = filt.base_file(i); g = base.group_of(bi); before = base.reclaimable(g)
+                try: os.remove(base.path(bi))
+                except OSError: errors += 1; continue
+                base.deleted[bi] = filt.view.deleted[i] = 1
+                reclaimable -= before - base.reclaimable(g)
+                SESSION["reclaimed"] += base.size(bi); SESSION["deleted"] += 1
+            draw_status(stdscr, f"Deleted {len(targets) - errors} files ({errors} failed). Freed {human_size(SESSION['reclaimed'])} this session.", 1.5)
+        elif not results.count(): continue
+        elif ch in [curses.KEY_UP, ord('k')]: sel_idx = results.step(sel_idx, -1)
+        elif ch in [curses.KEY_DOWN, ord('j')]: sel_idx = results.step(sel_idx, 1)
         elif char == 'h': break 
-        elif ch in [10, 13, ord('l')]: 
-            curr = lines[current_selection].strip()
+        elif ch in [10, 13, ord('l')] and not results.deleted[sel_idx]:
+            curr = results.path(sel_idx)
             choice = draw_multi_popup(stdscr, "Action:", ["[v] Play", "[d] Delete", "[c] Cancel"])
             if choice == 'v':
                 conn_info, client_ip, server_ip, user = get_connection_info()
-                if client_ip:
-                    sftp_url = f"sftp://{user}@{server_ip}{os.path.abspath(curr)}"
-                    subprocess.run(['ssh', '-f', client_ip, f"export DISPLAY=:0; vlc \"{sftp_url}\" > /dev/null 2>&1 &"])
-                else: subprocess.run(['vlc', curr], stderr=subprocess.DEVNULL)
+                play_video(curr, client_ip, server_ip, user)
             elif choice == 'd' and draw_popup_confirm(stdscr, f"Delete: {os.path.basename(curr)}?"):
-                try: os.remove(curr); lines[current_selection] = f"--- DELETED: {curr} ---"; draw_status(stdscr, "Deleted.")
+                try:
+                    bi = filt.base_file(sel_idx) if filtering else sel_idx
+                    g = base.group_of(bi); before = base.reclaimable(g)
+                    os.remove(curr); base.deleted[bi] = results.deleted[sel_idx] = 1
+                    reclaimable -= before - base.reclaimable(g)
+                    SESSION["reclaimed"] += base.size(bi); SESSION["deleted"] += 1
+                    draw_status(stdscr, f"Deleted. Freed {human_size(SESSION['reclaimed'])} this session.")
                 except Exception as e: draw_status(stdscr, f"Error: {str(e)}")
+    stdscr.timeout(-1); SESSION["review"] = SESSION["results"] = None
+    if sheets: sheets.close()
 
 def handle_file_open(stdscr, path, client_ip, server_ip, user):
     ext = os.path.splitext(path)[1].lower()
     if ext in VIDEO_EXTS:
         if draw_multi_popup(stdscr, "Video Action:", ["[v] Play in VLC", "[c] Cancel"]) == 'v':
-            if client_ip:
-                sftp_url = f"sftp://{user}@{server_ip}{os.path.abspath(path)}"
-                subprocess.run(['ssh', '-f', client_ip, f"export DISPLAY=:0; vlc \"{sftp_url}\" > /dev/null 2>&1 &"])
-            else: subprocess.run(['vlc', path], stderr=subprocess.DEVNULL)
+            play_video(path, client_ip, server_ip, user)
     elif ext in TEXT_EXTS or not ext:
         if draw_multi_popup(stdscr, "Text Action:", ["[v] View in Vim", "[c] Cancel"]) == 'v':
             curses.def_prog_mode(); curses.endwin(); subprocess.run(['vim', path]); curses.reset_prog_mode(); curses.curs_set(0); stdscr.refresh()
     else: subprocess.run(['xdg-open', path], stderr=subprocess.DEVNULL)
 
-def file_browser(stdscr):
-    draw_splash(stdscr)
+def file_browser(stdscr, fresh=False):
     conn_info, client_ip, server_ip, user = get_connection_info()
+    if client_ip: threading.Thread(target=warm_ssh_master, args=(client_ip,), daemon=True).start()  # never wait on ssh
     curses.start_color(); curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK); curses.init_pair(2, curses.COLOR_BLACK, curses.COLOR_GREEN); curses.curs_set(0)
     
-    current_path = os.path.abspath(os.getcwd())
+    launch_dir = current_path = os.path.abspath(os.getcwd())
     history, selection, start_index, show_hidden = [], 0, 0, False
     needs_refresh = True
-    entries = []
+    entries, dir_set, listed_mtime, check, loading = [], set(), 0, None, None
+    find_indexes, select_name = {}, None  # per-root FilenameIndex; entry to highlight after a Find jump
 
-    while True:
-        if needs_refresh:
-            try:
-                items = os.listdir(current_path)
-                if not show_hidden: items = [i for i in items if not i.startswith('.')]
-                dirs = sorted([d for d in items if os.path.isdir(os.path.join(current_path, d))], key=str.lower)
-                files = sorted([f for f in items if not os.path.isdir(os.path.join(current_path, f))], key=str.lower)
-                entries = ([".."] if current_path != "/" else []) + dirs + files
-            except: entries = [".. [Error]"]
-            needs_refresh = False
-
-        stdscr.clear(); h, w = stdscr.getmaxyx()
-        if selection >= len(entries): selection = max(0, len(entries)-1)
-        if selection < start_index: start_index = selection
-        elif selection >= start_index + (h-2): start_index = selection - (h-2) + 1
+    # Started from the same place as last time: come back to the same folder, cursor and review.
+    # The stored listing is drawn at once and checked against the folder's mtime in the background;
+    # the review's results load in the background too.
+    state = {} if fresh else load_session()
+    if state.get("launch_dir") == launch_dir and state.get("path"):
+        current_path, history, show_hidden = state["path"], state.get("history", []), state.get("show_hidden", False)
+        start_index, select_name = state.get("start_index", 0), state.get("selected")
+        if state.get("entries") is not None:
+            entries, dir_set, listed_mtime = state["entries"], set(state["dirs"]), state["mtime_ns"]
+            needs_refresh, check = False, ListingCheck(current_path, listed_mtime, show_hidden)
+            if select_name in entries: selection = entries.index(select_name)
+            select_name = None
+        if state.get("review"): loading = ReviewLoad(state["review"])
+
+    def session_state():
+        small = len(entries) <= SNAPSHOT_MAX
+        return {"launch_dir": launch_dir, "path": current_path, "history": history[-50:], "show_hidden": show_hidden,
+                "selected": entries[selection] if selection < len(entries) else None, "start_index": start_index,
+                "entries": entries if small else None, "dirs": sorted(dir_set) if small else None,
+                "mtime_ns": listed_mtime, "review": SESSION.get("review")}
+
+    try:
+        while True:
+            if needs_refresh:
+                try: entries, dir_set, listed_mtime = list_dir(current_path, show_hidden)
+                except: entries, dir_set, listed_mtime = [".. [Error]"], set(), 0
+                needs_refresh, check = False, None
+                if select_name in entries: selection = entries.index(select_name)
+                select_name = None
+                save_session(session_state())
+            elif check and check.done:
+                # The restored snapshot was stale: swap in the fresh listing, keeping the cursor on the same name.
+                if check.result:
+                    name = entries[selection] if selection < len(entries) else None
+                    entries, dir_set, listed_mtime = check.result
+                    selection = entries.index(name) if name in entries else min(selection, len(entries)-1)
+                check = None
+            if loading and loading.done:
+                review, results, loading = loading.review, loading.result, None
+                if results is not None: review_duplicates(stdscr, review["dup_file"], review["target"], select=review.get("file"), results=results)
+                continue
+
+            draw_t0 = time.perf_counter()
+            stdscr.clear(); h, w = stdscr.getmaxyx()
+            if selection >= len(entries): selection = max(0, len(entries)-1)
+            if selection < start_index: start_index = selection
+            elif selection >= start_index + (h-2): start_index = selection - (h-2) + 1
         
-        stdscr.addstr(0, 0, f" {conn_info} | {current_path} ".ljust(w-1)[:w-1], curses.color_pair(2))
-        for i, entry in enumerate(entries[start_index : start_index + (h-2)]):
-            idx = i + start_index; style = curses.color_pair(2) if idx == selection else curses.color_pair(1)
-            is_dir = os.path.isdir(os.path.join(current_path, entry)) or entry == ".."
-            label = f"[ {entry} ]" if is_dir else f"  {entry}"
-            stdscr.addstr(i + 1, 0, f"{'> ' if idx == selection else '  '}{label}"[:w-1].ljust(w-1)[:w-1], style)
+            stdscr.addstr(0, 0, f" {conn_info} | {current_path} ".ljust(w-1)[:w-1], curses.color_pair(2))
+            for i, entry in enumerate(entries[start_index : start_index + (h-2)]):
+                idx = i + start_index; style = curses.color_pair(2) if idx == selection else curses.color_pair(1)
+                is_dir = entry in dir_set or entry == ".."
+                label = f"[ {entry} ]" if is_dir else f"  {entry}"
+                stdscr.addstr(i + 1, 0, f"{'> ' if idx == selection else '  '}{label}"[:w-1].ljust(w-1)[:w-1], style)
         
-        footer = f" [g]GoTo [f]Find [4]Hidden [q]Quit ".ljust(w - len(f" {VERSION} ") - 1) + f" {VERSION} "
-        stdscr.addstr(h-1, 0, footer[:w-1], curses.color_pair(2))
-        stdscr.refresh()
+            footer = f" [g]GoTo [f]Find [4]Hidden [q]Quit ".ljust(w - len(f" {VERSION} ") - 1) + f" {VERSION} "
+            stdscr.addstr(h-1, 0, footer[:w-1], curses.color_pair(2))
+            stdscr.refresh(); METRICS.add("draw", time.perf_counter() - draw_t0, 1)
         
-        key = stdscr.getch()
-        char = chr(key).lower() if 0 <= key < 256 else ""
+            stdscr.timeout(50 if check or loading else -1)  # keep polling the background listing/review loads
+            key = stdscr.getch()
+            if key == -1: continue
+            loading = None  # a key pressed before the old review loaded: the user has moved on
+            char = chr(key).lower() if 0 <= key < 256 else ""
         
-        if key == ord('q'): break
-        elif key in [curses.KEY_UP, ord('k')]: selection = (selection - 1) % len(entries)
-        elif key in [curses.KEY_DOWN, ord('j')]: selection = (selection + 1) % len(entries)
-        elif char == 'h':
-            if current_path != "/":
-                history.append(current_path); current_path = os.path.dirname(current_path); selection = 0
-                needs_refresh = True
-        elif char == 'l':
-            target = os.path.join(current_path, entries[selection])
-            if entries[selection] == "..":
-                history.append(current_path); current_path = os.path.dirname(current_path); selection = 0
-                needs_refresh = True
-            elif os.path.isdir(target):
-                history.append(current_path); current_path = target; selection = 0
-                needs_refresh = True
-            else:
-                handle_file_open(stdscr, target, client_ip, server_ip, user)
-        elif key in [10, 13]: # ENTER
-            target = os.path.join(current_path, entries[selection])
-            if os.path.isdir(target) and entries[selection] != "..":
-                dup_file = os.path.join(target, "dups.txt") # Writing DIRECTLY to directory
+            if key == ord('q'): SESSION["review"] = SESSION["results"] = None; break
+            elif key in [curses.KEY_UP, ord('k')]: selection = (selection - 1) % len(entries)
+            elif key in [curses.KEY_DOWN, ord('j')]: selection = (selection + 1) % len(entries)
+            elif char == 'h':
+                if current_path != "/":
+                    history.append(current_path); current_path = os.path.dirname(current_path); selection = 0
+                    needs_refresh = True
+            elif char == 'l':
+                target = os.path.join(current_path, entries[selection])
+                if entries[selection] == "..":
+                    history.append(current_path); current_path = os.path.dirname(current_path); selection = 0
+                    needs_refresh = True
+                elif os.path.isdir(target):
+                    history.append(current_path); current_path = target; selection = 0
+                    needs_refresh = True
+                else:
+                    handle_file_open(stdscr, target, client_ip, server_ip, user)
+            elif key in [10, 13]: # ENTER
+                target = os.path.join(current_path, entries[selection])
+                if os.path.isdir(target) and entries[selection] != "..":
+                    dup_file = os.path.join(target, "dups.txt") # Writing DIRECTLY to directory
                 
-                opts = ["[s] Scan", "[c] Cancel"]
-                if os.path.exists(dup_file): opts.insert(0, "[v] View dups.txt")
+                    opts = ["[s] Scan", "[c] Cancel"]
+                    if os.path.exists(dup_file): opts.insert(0, "[v] View dups.txt")
                 
-                choice = draw_multi_popup(stdscr, "Folder Action:", opts)
-                if choice == 'v':
-                    review_duplicates(stdscr, dup_file, target)
-                elif choice == 's':
-                    threads = get_optimal_threads()
-                    exe = shutil.which("vid_dup_finder") or os.path.expanduser("~/.cargo/bin/vid_dup_finder")
-                    
-                    curses.def_prog_mode(); curses.endwin(); os.system('clear')
-                    print(f"--- SCANNING: {target} ---")
-                    print(f"Using {threads} threads via RAYON_NUM_THREADS...")
+                    choice = draw_multi_popup(stdscr, "Folder Action:", opts)
+                    if choice == 'v':
+                        review_duplicates(stdscr, dup_file, target)
+                    elif choice == 's':
+                        threads = get_optimal_threads()
+                        exe = shutil.which("vid_dup_finder") or os.path.expanduser("~/.cargo/bin/vid_dup_finder")
                     
-                    # REVERTED TO REDIRECTION '>' and removed '/tmp' usage
-                    scan_cmd = f'RAYON_NUM_THREADS={threads} {exe} --output dups --files "{target}" > "{dup_file}"'
+                        curses.def_prog_mode(); curses.endwin(); os.system('clear')
+                        print(f"--- SCANNING: {target} ---")
+                        print(f"Using {threads} threads via RAYON_NUM_THREADS...")
                     
-                    try:
-                        # Removed check=True to prevent crash if tool exits with warnings
-                        # Using shell redirection requires shell=True
-                        subprocess.run(scan_cmd, shell=True) 
-                        
-                        if os.path.exists(dup_file) and os.path.getsize(dup_file) > 0:
-                            print("\nScan complete. Returning to browser...")
-                        else:
-                            print(f"\nScan finished, but '{dup_file}' is empty or missing.")
-                            time.sleep(1.5)
-                    except Exception as e:
-                        print(f"\nExecution Error: {e}")
-                        time.sleep(3)
+                        scan_ok = False  # a failed scan never opens a partial review
+                        try:
+                            # Exact copies are cheap to prove (size + sampled hash); they go first in dups.txt and
+                            # all but one of each set is kept out of the expensive perceptual pass.
+                            print("Prefilter: grouping by size and sampled hash...")
+                            with METRICS.phase("prefilter"): exact, sizes = exact_video_sets(target)
+                            write_exact_sets(dup_file, exact)
+                            skip = [p for _, _, paths in exact for p in paths[1:]]
+                            print(f"Prefilter: {len(exact)} exact sets, {len(skip)} copies skipped by vid_dup_finder.")
+
+                            # Output still goes straight into dups.txt, appended after the exact sets. The argv is built
+                            # as a list (no shell), and the exclude list is capped so it cannot exceed the OS limit.
+                            scan_cmd = [exe, "--output", "dups", "--files", target]
+                            excluded = cap_excludes(skip)
+                            if excluded: scan_cmd += ["--exclude"] + excluded
+                            if len(excluded) < len(skip):
+                                print(f"Prefilter: {len(skip) - len(excluded)} copies over the argument limit are scanned anyway.")
+                            exact_bytes = os.path.getsize(dup_file)
+
+                            # No check=True: the tool can exit non-zero over a few unreadable files and still write its sets
+                            with METRICS.phase("scan"), open(dup_file, 'a') as out:
+                                status = subprocess.run(scan_cmd, stdout=out, env=dict(os.environ, RAYON_NUM_THREADS=str(threads))).returncode
+
+                            if os.path.getsize(dup_file) > exact_bytes:
+                                if status: print(f"\nvid_dup_finder exited with status {status}; showing what it wrote.")
+                                print("\nScan complete. Returning to browser..."); scan_ok = True
+                            elif status:
+                                print(f"\nScan FAILED: vid_dup_finder exited with status {status} and wrote no results.")
+                                input("Press Enter to return to the browser...")
+                            else:
+                                print("\nScan complete: no similar videos beyond the exact copies."); scan_ok = True
+                                time.sleep(1.5)
+                        except Exception as e:
+                            print(f"\nScan FAILED: {e}")
+                            input("Press Enter to return to the browser...")
                     
-                    curses.reset_prog_mode(); curses.curs_set(0); stdscr.refresh()
-                    if os.path.exists(dup_file):
-                        review_duplicates(stdscr, dup_file, target)
-            elif entries[selection] == "..":
-                history.append(current_path); current_path = os.path.dirname(current_path); selection = 0; needs_refresh = True
-            else:
-                handle_file_open(stdscr, target, client_ip, server_ip, user)
-        elif char == '4':
-            show_hidden = not show_hidden; needs_refresh = True
-        elif char == 'g':
-            from sys import path as pythonpath
-            res = draw_goto_menu(stdscr, len(history) > 0)
-            if res == "BACK": current_path = history.pop(); selection = 0; needs_refresh = True
-            elif res: history.append(current_path); current_path = res; selection = 0; needs_refresh = True
+                        curses.reset_prog_mode(); curses.curs_set(0); stdscr.refresh()
+                        if scan_ok and os.path.exists(dup_file):
+                            results = load_dup_file(dup_file); save_dup_sizes(dup_file, results, sizes)
+                            review_duplicates(stdscr, dup_file, target, results=results)
+                elif entries[selection] == "..":
+                    history.append(current_path); current_path = os.path.dirname(current_path); selection = 0; needs_refresh = True
+                else:
+                    handle_file_open(stdscr, target, client_ip, server_ip, user)
+            elif char == '4':
+                show_hidden = not show_hidden; needs_refresh = True
+            elif char == 'g':
+                from sys import path as pythonpath
+                res = draw_goto_menu(stdscr, len(history) > 0)
+                if res == "BACK": current_path = history.pop(); selection = 0; needs_refresh = True
+                elif res: history.append(current_path); current_path = res; selection = 0; needs_refresh = True
+            elif char == 'f':
+                index = find_indexes.get(current_path)
+                if index is None: index = find_indexes[current_path] = FilenameIndex(current_path)
+                else: index.start_refresh()  # cheap: only re-lists folders whose mtime changed
+                res = draw_find(stdscr, index)
+                if res:
+                    history.append(current_path); needs_refresh = True; selection = 0
+                    if res.endswith('/'): current_path = res.rstrip('/')
+                    else: current_path, select_name = os.path.dirname(res), os.path.basename(res)
+    finally:
+        if SESSION.get("review"): save_review_snapshot(SESSION["review"], SESSION["results"])
+        save_session(session_state())
 
 def draw_goto_menu(stdscr, has_history):
     bookmarks = [("1", "Home", os.path.expanduser("~")), ("2", "Docs", os.path.expanduser("~/Documents")), 
@@ -290,8 +1270,14 @@ def draw_goto_menu(stdscr, has_history):
         if ch == 27: return None
 
 if __name__ == "__main__":
-    if "-v" in sys.argv or "--version" in sys.argv:
-        print(f"dupVidBrowser {VERSION}"); sys.exit(0)
-    curses.wrapper(file_browser)
+    parser = argparse.ArgumentParser(description="Curses file browser for scanning and reviewing duplicate videos.")
+    parser.add_argument('-v', '--version', action='version', version=f"dupVidBrowser {VERSION}")
+    parser.add_argument('--fresh', action='store_true', help="Start in the current folder instead of restoring the last session")
+    add_metrics_args(parser)
+    args = parser.parse_args()
+    if args.metrics or args.profile: METRICS.enable(args.metrics, args.profile)
+    # A closed terminal or kill still unwinds normally, so the session is saved on the way out.
+    for sig in (signal.SIGHUP, signal.SIGTERM): signal.signal(sig, lambda *_: sys.exit(0))
+    curses.wrapper(file_browser, args.fresh)
 
-# VERSION: v.0.3.14
+# VERSION: v.0.3.34
@@ -4,18 +4,107 @@ import time
 import tkinter as tk
 from tkinter import messagebox
 
-# Version 00.01.00
+# Version 00.02.00
 #this is a python script that delivers a graphical user interface to help the user with anxiety through breathing methods. It asked the user for how many cycles of the breathing process it would like to run. Then for each number of cycles the script tells the user to take a deep breath in for five seconds, then hold it for five seconds, then let it out for five seconds and then proceeds to the next cycle
-
-# Function to display the breathing phase and countdown
-def display_phase(phase, seconds, label, color):
-    for i in range(seconds, 0, -1):
-        label.config(text=f"{phase}\n\n{i}", fg=color)
-        root.update()
-        time.sleep(1)
+# 00.02.00: timing runs off root.after with time.monotonic deadlines (no sleeps, no drift), so the window stays
+# responsive and can be paused or closed. Adds box and 4-7-8 patterns, custom phase lists and a breathing circle.
+
+# Breathing patterns as (phase, seconds) lists. Custom patterns use the same form, e.g. "Inhale 4, Hold 2, Exhale 6".
+PATTERNS = {
+    "Calm 5-5-5": [("Inhale", 5), ("Hold", 5), ("Exhale", 5)],
+    "Box 4-4-4-4": [("Inhale", 4), ("Hold", 4), ("Exhale", 4), ("Hold", 4)],
+    "4-7-8": [("Inhale", 4), ("Hold", 7), ("Exhale", 8)],
+    "Custom": None,
+}
+PHASE_COLORS = {"Inhale": "#ADD8E6", "Hold": "#FFFFE0", "Exhale": "#90EE90", "Rest": "#FFFFFF"}  # Light Blue / Yellow / Green
+REST_SECONDS = 2      # pause between cycles
+FRAME_MS = 33         # ~30 fps animation; the countdown itself is driven by deadlines, not frame counts
+CIRCLE_MIN, CIRCLE_MAX = 15, 55
+
+# Function to turn "Inhale 4, Hold 7, Exhale 8" into a phase list
+def parse_custom_pattern(text):
+    phases = []
+    for part in text.split(","):
+        name, _, seconds = part.strip().rpartition(" ")
+        name = name.strip().capitalize()
+        if name not in PHASE_COLORS or float(seconds) <= 0:
+            raise ValueError(f"Bad phase: '{part.strip()}'")
+        phases.append((name, float(seconds)))
+    if not phases:
+        raise ValueError("Enter at least one phase.")
+    return phases
+
+# Function to build the whole session timeline: (phase, start, end) offsets in seconds, rests between cycles
+def build_timeline(phases, cycles):
+    timeline, t = [], 0.0
+    for cycle in range(1, cycles + 1):
+        for name, seconds in phases:
+            timeline.append((name, t, t + seconds, cycle)); t += seconds
+        if cycle < cycles:
+            timeline.append(("Rest", t, t + REST_SECONDS, cycle)); t += REST_SECONDS
+    return timeline
+
+class BreathingSession:
+    """Drives the exercise from root.after callbacks. Every frame re-derives the phase from
+    time.monotonic(), so late callbacks never accumulate into drift."""
+    def __init__(self, root, timeline, on_frame, on_done):
+        self.root, self.timeline, self.on_frame, self.on_done = root, timeline, on_frame, on_done
+        self.start = time.monotonic()
+        self.paused_at, self.after_id, self.index = None, None, 0
+
+    def elapsed(self):
+        return (self.paused_at or time.monotonic()) - self.start
+
+    def tick(self):
+        self.after_id = None
+        now = self.elapsed()
+        while self.index < len(self.timeline) and now >= self.timeline[self.index][2]:
+            self.index += 1
+        if self.index >= len(self.timeline):
+            self.on_done(); return
+        name, begin, end, cycle = self.timeline[self.index]
+        self.on_frame(name, (now - begin) / (end - begin), end - now, cycle)
+        # Sleep until the next frame or the phase boundary, whichever comes first.
+        delay = min(FRAME_MS / 1000, end - now)
+        self.after_id = self.root.after(max(1, round(delay * 1000)), self.tick)
+
+    def toggle_pause(self):
+        if self.paused_at is None:
+            self.paused_at = time.monotonic()
+            if self.after_id: self.root.after_cancel(self.after_id); self.after_id = None
+        else:
+            self.start += time.monotonic() - self.paused_at
+            self.paused_at = None
+            self.tick()
+
+    def stop(self):
+        if self.after_id: self.root.after_cancel(self.after_id); self.after_id = None
+
+session = None
+circle_radius = CIRCLE_MIN
+
+# Function to draw one animation frame: countdown text plus a circle that grows and shrinks with the breath
+def display_phase(name, progress, remaining, cycle):
+    global circle_radius
+    if name == "Rest":
+        phase_label.config(text=f"Cycle {cycle} completed.\n\nPrepare for the next cycle...", fg=PHASE_COLORS["Rest"])
+    else:
+        phase_label.config(text=f"{name}\n\n{max(1, int(remaining + 0.999))}", fg=PHASE_COLORS[name])
+        if name == "Inhale": circle_radius = CIRCLE_MIN + (CIRCLE_MAX - CIRCLE_MIN) * progress
+        elif name == "Exhale": circle_radius = CIRCLE_MAX - (CIRCLE_MAX - CIRCLE_MIN) * progress
+    cx, cy, r = 60, 60, circle_radius
+    canvas.coords(circle, cx - r, cy - r, cx + r, cy + r)
+    canvas.itemconfig(circle, fill=PHASE_COLORS[name])
+
+def finish_breathing():
+    global session
+    session = None
+    pause_button.pack_forget()
+    phase_label.config(text="Breathing exercise completed.\n\nWell done!", fg="#FFFFFF")
 
 # Function to start the breathing exercise
 def start_breathing():
+    global session
     try:
         cycles = int(cycles_entry.get())
         if cycles <= 0:
@@ -23,32 +112,39 @@ def start_breathing():
     except ValueError:
         messagebox.showerror("Invalid Input", "Please enter a valid positive integer for cycles.")
         return
+    try:
+        phases = PATTERNS[pattern_var.get()] or parse_custom_pattern(custom_entry.get())
+    except ValueError as e:
+        messagebox.showerror("Invalid Pattern", f"{e}\n\nUse phases like: Inhale 4, Hold 7, Exhale 8")
+        return
 
-    # Remove input widgets after getting the number of cycles
-    instructions.pack_forget()
-    cycles_entry.pack_forget()
-    start_button.pack_forget()
+    # Remove input widgets after getting the settings
+    for widget in (instructions, settings_frame, start_button):
+        widget.pack_forget()
+    canvas.pack(pady=5, before=phase_label)
+    pause_button.pack(side=tk.BOTTOM, pady=10)
 
     # Start the breathing exercise
-    for cycle in range(1, cycles + 1):
-        display_phase("Inhale", 5, phase_label, "#ADD8E6")  # Light Blue
-        display_phase("Hold", 5, phase_label, "#FFFFE0")    # Light Yellow
-        display_phase("Exhale", 5, phase_label, "#90EE90")  # Light Green
+    session = BreathingSession(root, build_timeline(phases, cycles), display_phase, finish_breathing)
+    session.tick()
 
-        # Pause before the next cycle
-        phase_label.config(text=f"Cycle {cycle} completed.\n\nPrepare for the next cycle...", fg="#FFFFFF")
-        root.update()
-        time.sleep(2)
+def toggle_pause():
+    if session:
+        session.toggle_pause()
+        pause_button.config(text="Resume" if session.paused_at else "Pause")
 
-    phase_label.config(text="Breathing exercise completed.\n\nWell done!", fg="#FFFFFF")
+def close_window():
+    if session: session.stop()
+    root.destroy()
 
 # Create the GUI application
 root = tk.Tk()
 root.title("Calm Breathing Exercise")
+root.protocol("WM_DELETE_WINDOW", close_window)
 
 # Set window size and center it on the screen
 window_width = 400
-window_height = 300
+window_height = 380
 screen_width = root.winfo_screenwidth()
 screen_height = root.winfo_screenheight()
 position_top = int(screen_height / 2 - window_height / 2)
@@ -59,21 +155,34 @@ root.geometry(f'{window_width}x{window_height}+{position_right}+{position_top}')
 root.configure(bg="#2E4053")  # Calming dark blue
 
 # Instructions label
-instructions = tk.Label(root, text="Enter the number of breathing cycles and press Start:", font=("Helvetica", 12), bg="#2E4053", fg="#FFFFFF")
+instructions = tk.Label(root, text="Choose a pattern, enter the number of cycles and press Start:", font=("Helvetica", 12), bg="#2E4053", fg="#FFFFFF", wraplength=360)
 instructions.pack(pady=20)
 
-# Entry for the number of cycles
-cycles_entry = tk.Entry(root, width=10, font=("Helvetica", 12))
+# Pattern picker, custom phase list and number of cycles
+settings_frame = tk.Frame(root, bg="#2E4053")
+settings_frame.pack(pady=5)
+pattern_var = tk.StringVar(value="Calm 5-5-5")
+pattern_menu = tk.OptionMenu(settings_frame, pattern_var, *PATTERNS)
+pattern_menu.config(font=("Helvetica", 11), bg="#5DADE2", fg="#FFFFFF", activebackground="#3498DB", highlightthickness=0)
+pattern_menu.pack(pady=5)
+custom_entry = tk.Entry(settings_frame, width=28, font=("Helvetica", 11))
+custom_entry.insert(0, "Inhale 4, Hold 2, Exhale 6")
+custom_entry.pack(pady=5)
+cycles_entry = tk.Entry(settings_frame, width=10, font=("Helvetica", 12))
 cycles_entry.pack(pady=10)
 
 # Button to start the exercise
 start_button = tk.Button(root, text="Start", command=start_breathing, font=("Helvetica", 12), bg="#5DADE2", fg="#FFFFFF", activebackground="#3498DB", activeforeground="#FFFFFF")
 start_button.pack(pady=20)
 
+# Breathing circle (shown once the exercise starts) and pause button
+canvas = tk.Canvas(root, width=120, height=120, bg="#2E4053", highlightthickness=0)
+circle = canvas.create_oval(0, 0, 0, 0, outline="")
+pause_button = tk.Button(root, text="Pause", command=toggle_pause, font=("Helvetica", 12), bg="#5DADE2", fg="#FFFFFF", activebackground="#3498DB", activeforeground="#FFFFFF")
+
 # Label to display the current phase and countdown
 phase_label = tk.Label(root, text="", font=("Helvetica", 24), bg="#2E4053", fg="#FFFFFF")
 phase_label.pack(pady=30)
 
 # Run the application
 root.mainloop()
-
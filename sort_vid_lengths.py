@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# v.0.00.06
+# v.0.00.10
 # Start of sort_vid_lengths.py
 
 import os
@@ -7,15 +7,108 @@ import subprocess
 import argparse
 import sys
 import json # New: For handling our cache file!
+import time
+import atexit
+import ctypes # New: ctypes/select/struct talk to Linux inotify for --watch mode.
+import ctypes.util
+import errno
+import select
+import struct
+import signal
+from collections import defaultdict
+from contextlib import contextmanager # New: for the METRICS.phase(...) timer blocks.
 
 # --- Versioning and CLI Flags ---
-__version__ = "v.0.00.06" # The current version of our awesome script!
+__version__ = "v.0.00.10" # The current version of our awesome script!
 
 def display_version():
     """Displays the script version and exits."""
     print(f"Video Length Sorter CLI Tool {__version__}")
     sys.exit(0)
 
+# --- Metrics (--metrics / --profile) ---
+# New: A small stopwatch for the slow parts of a run - walking the tree, spawning ffprobe
+# and reading/writing the cache - so we can see where the time actually goes.
+class PhaseMetrics:
+    """
+    Adds up wall time and call counts per phase, plus a few simple counters.
+    It stays switched off (and nearly free) unless --metrics or --profile is given.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.phases = {} # phase name -> [total seconds, number of calls]
+        self.counters = defaultdict(int) # e.g. "cache_hits", "files_scanned"
+        self.started = time.perf_counter()
+        self.profiler = None
+
+    def enable(self, metrics_path: str = None, profile_path: str = None):
+        """Switches recording on; the report is printed (and optionally saved) when the script exits."""
+        self.enabled = True
+        self.started = time.perf_counter()
+        if profile_path:
+            import cProfile # Only imported when someone actually asks for a profile.
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        atexit.register(self.finish, metrics_path, profile_path)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times whatever runs inside the 'with' block and files it under `name`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = self.phases.setdefault(name, [0.0, 0])
+            record[0] += time.perf_counter() - start
+            record[1] += 1
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def finish(self, metrics_path: str, profile_path: str):
+        """Prints the per-phase report to stderr and writes it to metrics_path, if one was given."""
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(profile_path)
+        wall = time.perf_counter() - self.started
+        print(f"[metrics] sort_vid_lengths wall {wall:.3f}s", file=sys.stderr)
+        for name, (seconds, calls) in sorted(self.phases.items(), key=lambda kv: -kv[1][0]):
+            print(f"[metrics]   {name:<10} {seconds:9.3f}s  x{calls}", file=sys.stderr)
+        if not metrics_path:
+            return
+
+        # A filename ending in .prom gets the Prometheus textfile format (for node_exporter); anything else gets JSON.
+        if metrics_path.endswith(".prom"):
+            lines = [f'scan_wall_seconds{{tool="sort_vid_lengths"}} {wall:.6f}']
+            for name, (seconds, calls) in self.phases.items():
+                lines.append(f'scan_phase_seconds{{tool="sort_vid_lengths",phase="{name}"}} {seconds:.6f}')
+                lines.append(f'scan_phase_calls{{tool="sort_vid_lengths",phase="{name}"}} {calls}')
+            for name, n in self.counters.items():
+                lines.append(f'scan_counter{{tool="sort_vid_lengths",name="{name}"}} {n}')
+            text = "\n".join(lines) + "\n"
+        else:
+            text = json.dumps({
+                "tool": "sort_vid_lengths",
+                "version": __version__,
+                "timestamp": round(time.time(), 3),
+                "wall_seconds": round(wall, 6),
+                "phases": {name: {"seconds": round(seconds, 6), "calls": calls} for name, (seconds, calls) in self.phases.items()},
+                "counters": dict(self.counters),
+            }, indent=2)
+        try:
+            # Write a temp file first and swap it in, so nothing ever reads a half-written report.
+            with open(metrics_path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(metrics_path + ".tmp", metrics_path)
+        except OSError as e:
+            print(f"[metrics] Could not write '{metrics_path}': {e}", file=sys.stderr)
+
+METRICS = PhaseMetrics()
+
 # We'll parse arguments upfront to gracefully handle --version and --help flags.
 parser = argparse.ArgumentParser(
     description="This script will list video file lengths from longest to shortest, then save the output to 'lengths.txt'.",
@@ -37,6 +130,21 @@ parser.add_argument(
     action='store_true',
     help='Displays this help message and then exits.'
 )
+parser.add_argument(
+    '--metrics',
+    metavar='FILE',
+    help='Writes per-phase timings (walk, ffprobe, cache I/O) at exit: JSON, or a Prometheus textfile if FILE ends in .prom.'
+)
+parser.add_argument(
+    '--profile',
+    metavar='FILE',
+    help='Also dumps cProfile stats to FILE (view them with: python3 -m pstats FILE).'
+)
+parser.add_argument(
+    '-w', '--watch',
+    action='store_true',
+    help='Keeps running and updates lengths.txt and the cache as videos are added, changed or removed (always recursive).'
+)
 
 args = parser.parse_args()
 
@@ -51,6 +159,9 @@ if args.help:
     print("Please ensure FFmpeg is installed and 'ffprobe' is accessible in your system's PATH.")
     sys.exit(0)
 
+if args.metrics or args.profile:
+    METRICS.enable(args.metrics, args.profile)
+
 # --- Constants ---
 OUTPUT_FILENAME = "lengths.txt"
 CACHE_FILENAME = "video_lengths_cache.json" # New: Our cache file!
@@ -64,7 +175,7 @@ def load_cache() -> dict[str, float]:
     """
     try:
         if os.path.exists(CACHE_FILENAME):
-            with open(CACHE_FILENAME, 'r', encoding='utf-8') as f:
+            with METRICS.phase("cache_load"), open(CACHE_FILENAME, 'r', encoding='utf-8') as f:
                 return json.load(f)
     except json.JSONDecodeError:
         print(f"Warning: Cache file '{CACHE_FILENAME}' is corrupted or invalid. Starting with an empty cache.", file=sys.stderr)
@@ -77,7 +188,7 @@ def save_cache(cache_data: dict[str, float]):
     Saves current video duration data to the cache file.
     """
     try:
-        with open(CACHE_FILENAME, 'w', encoding='utf-8') as f:
+        with METRICS.phase("cache_save"), open(CACHE_FILENAME, 'w', encoding='utf-8') as f:
             json.dump(cache_data, f, indent=4) # Use indent for human-readable JSON
     except IOError as e:
         print(f"Error: Could not write to cache file '{CACHE_FILENAME}': {e}", file=sys.stderr)
@@ -107,6 +218,7 @@ def get_video_duration(file_path: str, cache: dict[str, float]) -> tuple[float |
     """
     # New: Check cache first!
     if file_path in cache:
+        METRICS.count("cache_hits")
         return cache[file_path], True # Found in cache!
     
     try:
@@ -123,7 +235,9 @@ def get_video_duration(file_path: str, cache: dict[str, float]) -> tuple[float |
         ]
         
         # Run the command and capture its output.
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
+        # Each ffprobe spawn is timed, since process startup usually dominates the scan.
+        with METRICS.phase("ffprobe"):
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
         duration_str = result.stdout.strip()
         
         # Convert the string output to a float.
@@ -177,6 +291,204 @@ def find_video_files(root_dir: str, recursive: bool) -> tuple[list[str], bool]:
             
     return video_files, has_subdirectories_found
 
+# --- Watch Mode (inotify via ctypes, polling fallback) ---
+# New: Linux tells us about file changes through inotify. Python has no built-in binding,
+# so we call the three libc functions we need through ctypes. Where that doesn't work
+# (macOS, containers without inotify...) we quietly fall back to rescanning on a timer.
+
+IN_CLOSE_WRITE = 0x8      # a file that was open for writing was closed (copy/encode finished)
+IN_MOVED_FROM = 0x40      # something was moved out of a watched folder
+IN_MOVED_TO = 0x80        # something was moved into a watched folder
+IN_CREATE = 0x100         # something was created (we only care about new folders here)
+IN_DELETE = 0x200         # something was deleted
+IN_DELETE_SELF = 0x400    # the watched folder itself was deleted
+IN_Q_OVERFLOW = 0x4000    # the kernel dropped events because we fell behind
+IN_ISDIR = 0x40000000     # the event is about a folder, not a file
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, name length - then the name itself
+WATCH_SETTLE = 1.0 # Seconds of quiet to wait for, so a folder full of copies is handled as one batch.
+POLL_INTERVAL = 30 # Seconds between rescans when inotify isn't available.
+
+class VideoWatcher:
+    """
+    Watches a folder tree for video files being added, changed, moved or deleted.
+
+    batches() yields (changed, removed) sets of paths after each burst of activity.
+    A removed path ending in os.sep means that whole folder is gone. (None, None)
+    means the kernel lost events and the caller should rescan from scratch.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self.folders = {} # inotify watch descriptor -> folder path
+        self.fd = -1
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+            if self.fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            self.watch_tree(root)
+        except (OSError, AttributeError) as e:
+            if self.fd >= 0:
+                os.close(self.fd)
+                self.fd = -1
+            print(f"[watch] inotify unavailable ({e}); polling every {POLL_INTERVAL}s", file=sys.stderr)
+            self.snapshot = self.take_snapshot() # What the tree looks like now, to compare the next poll against.
+
+    @property
+    def mode(self) -> str:
+        if self.fd >= 0:
+            return f"inotify ({len(self.folders)} dirs)"
+        return f"poll every {POLL_INTERVAL}s"
+
+    def watch_tree(self, top: str) -> set[str]:
+        """Adds a watch on top and every folder below it. Returns the videos already in there."""
+        videos = set()
+        for dirpath, _, filenames in os.walk(top):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                if ctypes.get_errno() == errno.ENOSPC:
+                    raise OSError(errno.ENOSPC, "out of inotify watches (raise fs.inotify.max_user_watches)")
+                continue # The folder vanished or isn't readable; nothing to watch.
+            self.folders[wd] = dirpath
+            videos.update(os.path.join(dirpath, f) for f in filenames if f.lower().endswith(VIDEO_EXTENSIONS))
+        return videos
+
+    def take_snapshot(self) -> dict[str, tuple[int, int]]:
+        """Polling mode: (size, mtime) for every video, so we can spot what changed between scans."""
+        snapshot = {}
+        for path in find_video_files(self.root, recursive=True)[0]:
+            try:
+                st = os.stat(path)
+                snapshot[path] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                pass # Deleted while we were looking; the next poll will sort it out.
+        return snapshot
+
+    def read_events(self, timeout):
+        """
+        Reads one chunk of inotify events. Returns (changed, removed), None if nothing
+        happened within timeout seconds, or "overflow" if the kernel dropped events.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        data = os.read(self.fd, 1 << 16)
+        changed, removed = set(), set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].split(b"\0", 1)[0]
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                return "overflow"
+            folder = self.folders.get(wd)
+            if folder is None:
+                continue # An event for a folder we've already stopped watching.
+            path = os.path.join(folder, os.fsdecode(name)) if name else folder
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # A new folder: watch it, and treat any videos already inside as new.
+                    changed.update(self.watch_tree(path))
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    # A folder went away: forget it and everything below it.
+                    removed.add(path + os.sep)
+                    for gone_wd in [w for w, d in self.folders.items() if d == path or d.startswith(path + os.sep)]:
+                        del self.folders[gone_wd]
+            elif mask & IN_DELETE_SELF:
+                self.folders.pop(wd, None)
+            elif name and path.lower().endswith(VIDEO_EXTENSIONS):
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    changed.add(path)
+                    removed.discard(path)
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    removed.add(path)
+                    changed.discard(path)
+        return changed, removed
+
+    def batches(self):
+        """Yields (changed, removed) once things have gone quiet after some activity. Runs forever."""
+        while True:
+            if self.fd < 0:
+                # Polling mode: rescan and compare against the last snapshot.
+                time.sleep(POLL_INTERVAL)
+                new_snapshot = self.take_snapshot()
+                changed = {p for p, signature in new_snapshot.items() if self.snapshot.get(p) != signature}
+                removed = set(self.snapshot) - set(new_snapshot)
+                self.snapshot = new_snapshot
+                if changed or removed:
+                    yield changed, removed
+                continue
+
+            # inotify mode: block until the first event, then keep collecting until WATCH_SETTLE of quiet.
+            changed, removed, lost = set(), set(), False
+            timeout = None
+            while True:
+                events = self.read_events(timeout)
+                if events is None:
+                    break
+                if events == "overflow":
+                    lost = True
+                else:
+                    new_changed, new_removed = events
+                    changed = (changed - new_removed) | new_changed
+                    removed = (removed - new_changed) | new_removed
+                timeout = WATCH_SETTLE
+            if lost:
+                yield None, None
+            elif changed or removed:
+                yield changed, removed
+
+def write_lengths_file(video_durations: list[dict]):
+    """
+    Sorts the entries longest first and writes them to lengths.txt.
+    Raises IOError if the file can't be written.
+    """
+    # The grand sorting! Longest videos first, as per your request.
+    video_durations.sort(key=lambda x: x['duration'], reverse=True)
+    with open(OUTPUT_FILENAME, 'w', encoding='utf-8') as f:
+        for entry in video_durations:
+            f.write(f"{format_duration(entry['duration'])} - {entry['path']}\n")
+
+def watch_lengths(target_directory: str):
+    """
+    New: --watch mode! Stays running and only runs ffprobe on videos that were added
+    or changed, rewriting lengths.txt and the cache after each batch of changes.
+    """
+    cache_data = load_cache()
+    watcher = VideoWatcher(target_directory) # Watch first so nothing slips by during the walk.
+    files, _ = find_video_files(target_directory, recursive=True)
+    known, failed = {os.path.abspath(f) for f in files}, set() # failed: don't re-probe broken files until they change
+
+    def write_out() -> int:
+        entries = []
+        for path in sorted(known - failed):
+            duration, _ = get_video_duration(path, cache_data)
+            if duration is None: failed.add(path)
+            else: entries.append({'path': os.path.relpath(path, start=target_directory), 'duration': duration})
+        try: write_lengths_file(entries)
+        except IOError as e: print(f"Oh dear! Could not write '{OUTPUT_FILENAME}': {e}", file=sys.stderr)
+        save_cache(cache_data)
+        return len(entries)
+
+    print(f"[watch] {write_out()} videos in '{target_directory}'; {watcher.mode}. Ctrl-C to stop.")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for changed, removed in watcher.batches():
+            if changed is None: # Events were lost, so start over from a fresh walk.
+                files, _ = find_video_files(target_directory, recursive=True)
+                known, changed, removed = {os.path.abspath(f) for f in files}, set(), set()
+            for path in removed:
+                gone = {p for p in known if p.startswith(path)} if path.endswith(os.sep) else {path}
+                known -= gone; failed -= gone
+                for p in gone: cache_data.pop(p, None)
+            for path in changed:
+                cache_data.pop(path, None); failed.discard(path) # Contents changed, so the old duration is stale.
+                if os.path.isfile(path): known.add(path)
+            print(f"[watch] {time.strftime('%H:%M:%S')} +{len(changed)} -{len(removed)} -> {write_out()} videos")
+    except (KeyboardInterrupt, SystemExit):
+        save_cache(cache_data)
+
 # --- Main Script Logic ---
 def main():
     target_directory = os.path.abspath(args.directory)
@@ -186,9 +498,14 @@ def main():
         print(f"Oopsie! The directory '{target_directory}' does not exist or isn't a directory. Please check the path and try again.", file=sys.stderr)
         sys.exit(1)
 
+    if args.watch:
+        watch_lengths(target_directory)
+        return
+
     # First, find all files to determine if subdirectories are even an issue.
     # We temporarily search recursively here to correctly set `has_subdirectories_found`.
-    all_potential_files, has_subdirectories_in_full_scan = find_video_files(target_directory, recursive=True)
+    with METRICS.phase("walk"):
+        all_potential_files, has_subdirectories_in_full_scan = find_video_files(target_directory, recursive=True)
 
     if not all_potential_files:
         print(f"Bummer! No video files of known types were found in '{target_directory}' or its subdirectories.")
@@ -210,7 +527,9 @@ def main():
                 print("Hmm, that wasn't a 'y' or 'n'. Please try again!")
 
     # Now, filter the files based on the user's recursive choice.
-    files_to_process, _ = find_video_files(target_directory, recursive=recursive_search_choice)
+    with METRICS.phase("walk"):
+        files_to_process, _ = find_video_files(target_directory, recursive=recursive_search_choice)
+    METRICS.count("files_scanned", len(files_to_process))
     
     if not files_to_process:
         print(f"After applying your search preference ({'recursive' if recursive_search_choice else 'non-recursive'}), no video files were found to process in '{target_directory}'.")
@@ -240,14 +559,9 @@ def main():
         print("Looks like we couldn't retrieve durations for any video files. Make sure your files are valid and ffprobe is playing nice.")
         sys.exit(0)
 
-    # The grand sorting! Longest videos first, as per your request.
-    video_durations.sort(key=lambda x: x['duration'], reverse=True)
-
     # Time to write our masterpiece to lengths.txt!
     try:
-        with open(OUTPUT_FILENAME, 'w', encoding='utf-8') as f:
-            for entry in video_durations:
-                f.write(f"{format_duration(entry['duration'])} - {entry['path']}\n")
+        write_lengths_file(video_durations)
         print(f"\nSuccess! Your video lengths have been lovingly written to '{OUTPUT_FILENAME}' in the current directory.")
         print("Happy organizing! ✨")
     except IOError as e:
@@ -261,4 +575,4 @@ def main():
 if __name__ == "__main__":
     main()
 
-# End of sort_vid_lengths.py v.0.00.06
+# End of sort_vid_lengths.py v.0.00.10
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# VERSION: 0.1.01
+# VERSION: 0.1.04
 # ==============================================================================
 # SCRIPT: video_replacer.py
 # PURPOSE: Recursively manages the replacement of original video files with 
@@ -24,14 +24,106 @@
 # 1. Make executable: chmod +x video_replacer.py
 # 2. Run from the root directory: ./video_replacer.py
 # 3. Run specifying a root directory: ./video_replacer.py /path/to/media
+# 4. Time each phase: ./video_replacer.py --metrics replacer.json [--profile replacer.pstats]
 # ==============================================================================
 import os
 import sys
 import argparse
+import json
+import time
+import atexit
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
+from types import SimpleNamespace
 
 # Define the marker used in filenames that indicates a compressed file
 COMPRESSED_MARKER = "_compressed"
+VERSION = "0.1.04"
+
+# --- Metrics (--metrics / --profile) ---
+class PhaseMetrics:
+    """
+    Times each phase of a run (rglob, move, cleanup, rename) and counts deleted originals.
+    Does nothing until enable() is called, so normal runs pay almost no cost.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.phases = {}                   # phase name -> [seconds, calls, bytes]
+        self.counters = defaultdict(int)   # e.g. "originals_deleted"
+        self.started = time.perf_counter()
+        self.profiler = None
+
+    def enable(self, metrics_path=None, profile_path=None):
+        """Start recording; the summary is printed (and optionally written to a file) at exit."""
+        self.enabled = True
+        self.started = time.perf_counter()
+        if profile_path:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        atexit.register(self.finish, metrics_path, profile_path)
+
+    @contextmanager
+    def phase(self, name):
+        """Times the 'with' block under name. Add to .nbytes on the yielded object to record bytes freed."""
+        timer = SimpleNamespace(nbytes=0)
+        if not self.enabled:
+            yield timer
+            return
+        t0 = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            record = self.phases.setdefault(name, [0.0, 0, 0])
+            record[0] += time.perf_counter() - t0
+            record[1] += 1
+            record[2] += timer.nbytes
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def finish(self, metrics_path, profile_path):
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(profile_path)
+        wall = time.perf_counter() - self.started
+        print(f"[metrics] video_replacer wall {wall:.3f}s", file=sys.stderr)
+        for name, (seconds, calls, nbytes) in sorted(self.phases.items(), key=lambda kv: -kv[1][0]):
+            freed = f"  {nbytes / 1048576:.1f} MiB" if nbytes else ""
+            print(f"[metrics]   {name:<8} {seconds:9.3f}s  x{calls}{freed}", file=sys.stderr)
+        if not metrics_path:
+            return
+
+        # A .prom file is a Prometheus textfile for node_exporter; anything else gets JSON.
+        if metrics_path.endswith(".prom"):
+            lines = [f'scan_wall_seconds{{tool="video_replacer"}} {wall:.6f}']
+            for name, (seconds, calls, _) in self.phases.items():
+                lines.append(f'scan_phase_seconds{{tool="video_replacer",phase="{name}"}} {seconds:.6f}')
+                lines.append(f'scan_phase_calls{{tool="video_replacer",phase="{name}"}} {calls}')
+            lines.append(f'cleanup_bytes_freed{{tool="video_replacer"}} {sum(b for _, _, b in self.phases.values())}')
+            for name, n in self.counters.items():
+                lines.append(f'scan_counter{{tool="video_replacer",name="{name}"}} {n}')
+            text = "\n".join(lines) + "\n"
+        else:
+            text = json.dumps({"tool": "video_replacer", "version": VERSION, "timestamp": round(time.time(), 3),
+                               "wall_seconds": round(wall, 6), "counters": dict(self.counters),
+                               "phases": {name: {"seconds": round(s, 6), "calls": c, "bytes_freed": b}
+                                          for name, (s, c, b) in self.phases.items()}}, indent=2)
+        try:
+            # Write to a temp file and swap it in, so a reader never sees half a file.
+            with open(metrics_path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(metrics_path + ".tmp", metrics_path)
+        except OSError as e:
+            print(f"[metrics] Could not write '{metrics_path}': {e}", file=sys.stderr)
+
+def add_metrics_args(parser):
+    parser.add_argument('--metrics', metavar='FILE', help="Write phase timings at exit (JSON, or a Prometheus textfile if FILE ends in .prom).")
+    parser.add_argument('--profile', metavar='FILE', help="Also dump cProfile stats to FILE (view with: python3 -m pstats FILE).")
+
+METRICS = PhaseMetrics()
 
 def phase_one_move_and_cleanup(root_dir):
     """
@@ -43,7 +135,8 @@ def phase_one_move_and_cleanup(root_dir):
     print(f"Starting recursive search from: {root_path}")
     
     # Find all 'CompressedVideos' directories recursively
-    compressed_video_dirs = list(root_path.rglob('CompressedVideos'))
+    with METRICS.phase("rglob"):
+        compressed_video_dirs = list(root_path.rglob('CompressedVideos'))
     modified_parents = set()
     
     if not compressed_video_dirs:
@@ -74,17 +167,22 @@ def phase_one_move_and_cleanup(root_dir):
 
             try:
                 # 1. Move the file to the parent directory
-                comp_file.rename(target_path)
+                with METRICS.phase("move"):
+                    comp_file.rename(target_path)
                 moved_count += 1
                 
                 # 2. Cleanup: Delete any file in the parent that is NOT a compressed file
                 print(f"    Cleaning up originals in: {parent_dir.name}")
                 
-                for item in parent_dir.iterdir():
-                    # Check if it's a file AND if its name does NOT contain the compressed marker
-                    if item.is_file() and COMPRESSED_MARKER not in item.name:
-                        print(f"      [DELETING] Original/Other file: {item.name}")
-                        item.unlink()
+                with METRICS.phase("cleanup") as t:
+                    for item in parent_dir.iterdir():
+                        # Check if it's a file AND if its name does NOT contain the compressed marker
+                        if item.is_file() and COMPRESSED_MARKER not in item.name:
+                            print(f"      [DELETING] Original/Other file: {item.name}")
+                            if METRICS.enabled:
+                                t.nbytes += item.stat().st_size  # bytes freed
+                            item.unlink()
+                            METRICS.count("originals_deleted")
                         
             except Exception as e:
                 print(f"  [ERROR] Failed to process {comp_file.name}: {e}")
@@ -127,7 +225,8 @@ def phase_two_rename_and_finalize(modified_parents):
             print(f"  Renaming: '{file_path.name}' -> '{target_path.name}'")
             
             try:
-                file_path.rename(target_path)
+                with METRICS.phase("rename"):
+                    file_path.rename(target_path)
                 renamed_count += 1
             except Exception as e:
                 print(f"  [ERROR] Failed to rename {file_path.name}: {e}")
@@ -142,7 +241,7 @@ def main():
     parser.add_argument(
         '-v', '--version', 
         action='version', 
-        version='%(prog)s 0.1.01'
+        version=f'%(prog)s {VERSION}'
     )
     parser.add_argument(
         'root_directory', 
@@ -150,8 +249,11 @@ def main():
         default='.', 
         help="The starting directory to search recursively (defaults to current directory)."
     )
+    add_metrics_args(parser)
     
     args = parser.parse_args()
+    if args.metrics or args.profile:
+        METRICS.enable(args.metrics, args.profile)
     
     # --- PHASE 1 ---
     modified_dirs = phase_one_move_and_cleanup(args.root_directory)